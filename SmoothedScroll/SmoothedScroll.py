@@ -1,124 +1,374 @@
+import gc
 import math
+import sys
+from multiprocessing.connection import Connection
+from threading import Thread
 from time import perf_counter
-from typing import Union, Callable
+from typing import Union, Callable, Optional
+
+from .models import SmoothedScrollConfig, ScrollConfig, ScrollEventQueue, MergedEventStore, TimerTask
+from .utils import BlocklistWatcher, ControlChannel, Timer, TIMER_SPIN, VirtualTimer, TraceRecorder, CurveCache, WheelRing, EngineMetrics, GcPauseMonitor, StackSampler, TelemetryRing, HOOK_BUDGET, OutputSink, CallbackSink, RefreshRateProvider, StaticRefreshRate, CachedRefreshRate, pulse
+
+
+def accelerate(delta: Union[int, float], elapsed: Union[int, float], config: ScrollConfig) -> float:
+    delta = math.copysign(config.distance, delta) if config.distance else delta
+
+    if elapsed < config.acceleration_delta:
+        acceleration = config.opposite_acceleration if delta > 0 else config.acceleration
+        factor = (1 + 0.05 / elapsed) / 2 * acceleration
+        if factor > 1:
+            delta *= min(factor, config.acceleration_max)
+
+    return delta
+
+
+def _emits(excess: float, delta: float) -> bool:
+    # the frame's integer output for one axis, with the same carry arithmetic as the frame itself
+    fraction, whole = math.modf(delta)
+    return bool(int(whole + math.modf(excess + fraction)[1]))
 
-from .models import SmoothedScrollConfig, ScrollConfig, ScrollEvent
-from .utils import Timer, MouseListener, get_display_frequency, set_console_ctrl_handler, scroll
 
 class SmoothedScroll:
-    def __init__(self, config: SmoothedScrollConfig):
-        self._pulse_normalize = 1
-        self._timer = Timer(daemon=True)
-        self._listener = MouseListener(
-            callback=self.scroll,
+    def __init__(
+            self,
+            config: SmoothedScrollConfig,
+            clock: Optional[Callable[[], float]] = None,
+            timer: Optional[Union[Timer, VirtualTimer]] = None,
+            source: Optional[Callable[..., Thread]] = None,
+            sink: Optional[Union[OutputSink, Callable[[int, bool], None]]] = None,
+            display_frequency: Optional[int] = None,
+            refresh_rate: Optional[RefreshRateProvider] = None,
+            trace_path: Optional[str] = None,
+            metrics: bool = False,
+            metrics_path: Optional[str] = None,
+            blocklist_path: Optional[str] = None,
+            control: Optional[Connection] = None,
+            sparse_frames: bool = False,
+            immediate_first_frame: bool = False,
+            defer_gc: bool = False,
+            telemetry: Optional[str] = None,
+            hook_budget: float = HOOK_BUDGET,
+            timer_spin: float = TIMER_SPIN
+    ):
+        # the win32 defaults are only imported when no replacement is given, so the engine can run headless
+        if source is None:
+            from .utils.scroll_listener import MouseListener as source
+        if sink is None:
+            from .utils.scroll_listener import SendInputSink
+            sink = SendInputSink()
+        elif not isinstance(sink, OutputSink):
+            sink = CallbackSink(sink)
+        if refresh_rate is None and display_frequency is not None:
+            refresh_rate = StaticRefreshRate(display_frequency)
+        if refresh_rate is None:
+            from .utils.scroll_listener import Win32DisplayQuery
+            refresh_rate = CachedRefreshRate(Win32DisplayQuery())
+
+        self._clock = clock or perf_counter
+        self._sink = sink
+        self._curves = CurveCache()
+        self._timer = timer or Timer(daemon=True, spin=timer_spin)
+        self._ring = WheelRing()
+        self._blocklist = BlocklistWatcher(blocklist_path, daemon=True) if blocklist_path else None
+        self._metrics = EngineMetrics() if metrics or metrics_path else None
+        self._metrics_path = metrics_path
+        self._gc_monitor = GcPauseMonitor(lambda: self._pending) if self._metrics is not None else None
+        self._defer_gc = defer_gc
+        self._recorder = TraceRecorder(trace_path, self.push, self._clock) if trace_path else None
+        self._listener = source(
+            callback=self._recorder or self.push,
             config=config,
+            display_change_callback=refresh_rate.invalidate,
+            blocklist=self._blocklist,
+            hook_budget=hook_budget,
             daemon=True
         )
-        self._display_frequency = get_display_frequency()
-        self._refresh_rate = (1000 / self._display_frequency - 0.3) / 1000
-        self._queue = []
+        self._refresh = refresh_rate
+        self._profiler = None
+        self._telemetry = TelemetryRing.attach(telemetry) if telemetry else None
+        self._control = ControlChannel(control, {
+            'config': self.update_config,
+            'pause': lambda _: self.pause(),
+            'resume': lambda _: self.resume(),
+            'stop': lambda _: self.join(),
+            'profile': lambda options: self.profile(**options),
+        }, self._timer, daemon=True) if control else None
+        self._refresh_rate = 1 / refresh_rate.frequency()
+        self._frame_deadline = 0
+        self._frame_task = TimerTask(self._frame, 0, 0)
+        self._queue = ScrollEventQueue()
+        self._merged = MergedEventStore()
         self._pending = False
+        self._sparse = sparse_frames
+        self._immediate = immediate_first_frame
+        self._grid_shift = 0  # moves the frame after an immediate one onto the frame clock
+        self._lookahead = 0  # how far past its run time a frame samples the curves
+        self._sleeping = False  # a sparse frame was scheduled past the next frame deadline
         self._previous_scroll_time = 0
         self._excess_delta_x = 0
         self._excess_delta_y = 0
+        self._warm_curves(config)
 
     def start(self, is_block: bool = True):
+        # gc.callbacks is process-wide, so the monitor is only in there between start() and join()
+        if self._gc_monitor:
+            self._gc_monitor.install()
         self._timer.start()
+        if self._blocklist:
+            self._blocklist.start()
         self._listener.start()
-        set_console_ctrl_handler(lambda _: self.join())
+        if self._control:
+            self._control.start()
+        if sys.platform == 'win32':
+            from .utils.scroll_listener import set_console_ctrl_handler
+            set_console_ctrl_handler(lambda _: self.join())
+        if self._defer_gc:
+            # everything set up so far lives as long as the process; keep it out of every later collection
+            gc.collect()
+            gc.freeze()
         if is_block:
             self._listener.listen()
 
-    def scroll(self, delta: Union[int, float], is_horizontal: bool, config: ScrollConfig) -> None:
-        delta = math.copysign(config.distance, delta) if config.distance else delta
-        current_time = perf_counter()
+    def push(self, delta: Union[int, float], is_horizontal: bool, config: ScrollConfig) -> None:
+        # runs on the hook thread: stamp the event into the ring and leave the smoothing to the timer thread,
+        # which only needs waking when no animation is running (it drains the ring every frame otherwise) or
+        # when sparse frames are being skipped
+        if self._ring.push(self._clock(), delta, is_horizontal, config):
+            if not self._pending:
+                self._timer.set_deadline(self._drain, self._clock())
+            elif self._sleeping:
+                self._timer.set_deadline(self._wake, self._clock())
 
-        if (elapsed := current_time - self._previous_scroll_time) < config.acceleration_delta:
-            acceleration = config.opposite_acceleration if delta > 0 else config.acceleration
-            factor = (1 + 0.05 / elapsed) / 2 * acceleration
-            if factor > 1:
-                delta *= min(factor, config.acceleration_max)
+    def _drain(self) -> None:
+        while (event := self._ring.pop()) is not None:
+            self.scroll(*event)
+
+    def scroll(
+            self,
+            delta: Union[int, float],
+            is_horizontal: bool,
+            config: ScrollConfig,
+            current_time: Optional[float] = None
+    ) -> None:
+        if current_time is None:
+            current_time = self._clock()
+        delta = accelerate(delta, current_time - self._previous_scroll_time, config)
 
         self._previous_scroll_time = current_time
-        self._queue.append(ScrollEvent(delta, is_horizontal, config))
+        if self._metrics is not None:
+            self._metrics.input(current_time)
+        queue = self._merged if config.merge_impulses else self._queue
+        queue.append(delta, is_horizontal, config.duration, current_time, self._curves.get(config))
 
         if not self._pending:
             self._request_scroll()
 
     def _request_scroll(self):
-        def request_scroll():
-            delta_x, delta_y = 0, 0
-
-            for scroll_event in self._queue[:]:  # iterate over a copy since we might remove items
-                elapsed = perf_counter() - scroll_event.start
-                finished = elapsed >= scroll_event.config.duration
-                progress = self._pulse(
-                    1 if finished else elapsed / scroll_event.config.duration,
-                    scroll_event.config.pulse_scale
-                )
-
-                delta = scroll_event.ease(progress) - scroll_event.previous_delta
-                
-                if scroll_event.is_horizontal:
-                    delta_y += delta
-                else:
-                    delta_x += delta
-                
-                scroll_event.previous_delta += delta
-
-                if finished:
-                    self._queue.remove(scroll_event)
-
-            excess_x, delta_x = math.modf(delta_x)
-            self._excess_delta_x, extra_x = math.modf(self._excess_delta_x + excess_x)
-
-            excess_y, delta_y = math.modf(delta_y)
-            self._excess_delta_y, extra_y = math.modf(self._excess_delta_y + excess_y)
-
-            if (int_delta_x := int(delta_x + extra_x)):
-                scroll(int_delta_x, False)
-            if (int_delta_y := int(delta_y + extra_y)):
-                scroll(int_delta_y, True)
-
-            if self._queue:
-                return self.__request_frame(request_scroll, self._refresh_rate)
-
-            self._excess_delta_x = self._excess_delta_y = 0
-            self._pending = False
-
-        self.__request_frame(request_scroll, 0)
+        # the cursor rarely changes monitors mid-animation, so the interval is only looked up as one starts
+        self._refresh_rate = 1 / self._refresh.frequency()
         self._pending = True
+        if self._defer_gc:
+            gc.disable()
+        if self._immediate:
+            return self._first_frame()
+        self._frame_deadline = self._clock()
+        self.__request_frame(self._frame_deadline)
 
-    def __request_frame(self, callback: Callable, timeout: Union[int, float]) -> None:
-        self._timer.set_timeout(callback, timeout)
+    def _first_frame(self) -> None:
+        # runs the first frame right here, as the event is dequeued, instead of going back through the timer;
+        # the frames after it land on the display's vblanks, or keep the previous animation's grid when the
+        # display can't report its phase
+        # Every frame in this mode samples the curves at the vblank its output is shown on rather than when it
+        # runs: the next one for this first frame, one interval on for the frames that run on the grid. Sampled
+        # at its run time, this frame would sit at elapsed 0 and emit nothing
+        now = self._clock()
+        vblank = self._refresh.last_vblank()
+        anchor = self._frame_deadline if vblank is None else vblank
+        self._grid_shift = -((now - anchor) % self._refresh_rate)
+        self._frame_deadline = now
+        self._lookahead = self._refresh_rate + self._grid_shift
+        self._frame()
+        self._lookahead = self._refresh_rate
 
-    def _pulse(self, x: Union[int, float], scale: Union[int, float]):
-        if x >= 1:
-            return 1
-        if x <= 0:
-            return 0
+    def _frame(self) -> None:
+        current_time = self._clock()
+        self._sleeping = False
+        self._drain()
+        sample_time = current_time + self._lookahead
+        delta_x, delta_y = self._queue.advance(sample_time)
+        if self._merged:
+            merged_x, merged_y = self._merged.advance(sample_time)
+            delta_x += merged_x
+            delta_y += merged_y
 
-        if self._pulse_normalize == 1:
-            self._pulse_normalize /= self.__pulse(1, scale)
+        excess_x, delta_x = math.modf(delta_x)
+        self._excess_delta_x, extra_x = math.modf(self._excess_delta_x + excess_x)
 
-        return self.__pulse(x, scale)
+        excess_y, delta_y = math.modf(delta_y)
+        self._excess_delta_y, extra_y = math.modf(self._excess_delta_y + excess_y)
 
-    def __pulse(self, x: Union[int, float], scale: Union[int, float]):
-        x_scaled = x * scale
-        if x_scaled < 1:
-            val = x_scaled - (1 - math.exp(-x_scaled))
-        else:
-            start = math.exp(-1)
-            val = start + ((1 - math.exp(-x_scaled + 1)) * (1 - start))
+        int_delta_x = int(delta_x + extra_x)
+        int_delta_y = int(delta_y + extra_y)
+        if int_delta_x or int_delta_y:
+            self._sink.emit(int_delta_x, int_delta_y)
 
-        return val * self._pulse_normalize
+        if self._metrics is not None:
+            self._record_frame(current_time, int_delta_x or int_delta_y)
+        if self._telemetry is not None:
+            self._telemetry.publish(
+                current_time, int_delta_x, int_delta_y, len(self._queue) + len(self._merged),
+                current_time - self._frame_deadline
+            )
+
+        if self._queue or self._merged:
+            deadline = self._next_frame_deadline(current_time)
+            if self._sparse and (wake := self._next_emission_deadline(deadline)) > deadline:
+                self._frame_deadline = wake
+                self._sleeping = True
+                self.__request_frame(wake)
+                if self._ring:  # same race as below: the hook may have pushed before _sleeping was set
+                    self._wake()
+                return
+            return self.__request_frame(deadline)
+
+        self._excess_delta_x = self._excess_delta_y = 0
+        self._pending = False
+        if self._defer_gc:
+            self._collect_deferred()
+        if self._metrics is not None:
+            self._end_animation()
+        if self._ring:  # pushed after the drain above, while _pending still told the hook not to wake us
+            self._drain()
+
+    def _collect_deferred(self) -> None:
+        # collections were held off while frames were due; run the young generation now if it came due,
+        # the older ones follow through the normal thresholds
+        gc.enable()
+        if gc.get_count()[0] > gc.get_threshold()[0]:
+            if self._gc_monitor:
+                self._gc_monitor.deferred += 1
+            gc.collect(0)
+
+    def _record_frame(self, current_time: float, emitted: int) -> None:
+        if emitted:
+            self._metrics.emit(current_time)
+        self._metrics.frame(
+            current_time - self._frame_deadline,
+            self._clock() - current_time,
+            len(self._queue) + len(self._merged),
+            self._excess_delta_x,
+            self._excess_delta_y
+        )
+
+    def _end_animation(self) -> None:
+        self._metrics.animation_end()
+        if self._metrics_path:
+            self._metrics.export(self._metrics_path)
+
+    def _next_frame_deadline(self, current_time: float) -> float:
+        # deadlines are absolute so lateness doesn't accumulate; frames that were missed entirely are skipped
+        deadline = self._frame_deadline + self._refresh_rate + self._grid_shift
+        self._grid_shift = 0
+        if deadline <= current_time:
+            deadline += (current_time - deadline) // self._refresh_rate * self._refresh_rate + self._refresh_rate
+        self._frame_deadline = deadline
+        return deadline
+
+    def _next_emission_deadline(self, deadline: float) -> float:
+        # the first frame deadline from this one on that emits a whole pixel, found by evaluating the curve
+        # tables ahead of time. It is the frame the dense loop would emit on, so only frames that would just grow
+        # the carry are skipped and output matches up to float rounding. The frame that ends the animation always runs
+        end = max(self._queue.end_time(), self._merged.end_time()) - self._lookahead
+        while deadline < end:
+            delta_x, delta_y = self._queue.peek(deadline + self._lookahead)
+            if self._merged:
+                merged_x, merged_y = self._merged.peek(deadline + self._lookahead)
+                delta_x += merged_x
+                delta_y += merged_y
+            if _emits(self._excess_delta_x, delta_x) or _emits(self._excess_delta_y, delta_y):
+                break
+            deadline += self._refresh_rate
+        return deadline
+
+    def _wake(self) -> None:
+        # new input while sparse frames are skipped: bring the frame back to the next deadline on the same grid,
+        # where it drains the ring exactly as the dense loop would have
+        if not self._sleeping:
+            return
+        deadline = self._frame_deadline
+        deadline -= (deadline - self._clock()) // self._refresh_rate * self._refresh_rate
+        self._frame_deadline = deadline
+        self._sleeping = False
+        self._timer.reschedule(self._frame_task, deadline)
+
+    def __request_frame(self, deadline: Union[int, float]) -> None:
+        # one task is rearmed for every frame instead of allocating a TimerTask per tick
+        self._timer.schedule(self._frame_task, deadline)
+
+    def _pulse(self, x: Union[int, float], scale: Union[int, float]):
+        return pulse(x, scale)
+
+    def get_stats(self) -> dict:
+        return {
+            'engine': self._metrics.as_dict() if self._metrics is not None else None,
+            'timer': self._timer.stats.as_dict() if hasattr(self._timer, 'stats') else None,
+            'hook': self.hook_stats(),
+            'gc': self._gc_monitor.as_dict() if self._gc_monitor else None,
+        }
+
+    def hook_stats(self) -> dict:
+        hook_durations = getattr(self._listener, 'hook_durations', None)
+        watchdog = getattr(self._listener, 'watchdog', None)
+        return {
+            'durations': hook_durations.as_dict() if hook_durations else None,
+            'watchdog': watchdog.stats() if watchdog else None,
+            'ring_drops': self._ring.drops,
+        }
 
     def join(self) -> None:
         self._listener.join()
         self._timer.join()
+        if self._blocklist:
+            self._blocklist.stop()
+        if self._recorder:
+            self._recorder.close()
+        if self._profiler is not None and self._profiler.is_alive():
+            self._profiler.stop()
+            self._profiler.join()
+        if self._gc_monitor:
+            self._gc_monitor.uninstall()
+        if self._defer_gc:
+            gc.enable()
+        if self._telemetry is not None:
+            self._telemetry.close()
+            self._telemetry = None
+
+    def profile(self, path: str, duration: Union[int, float] = 10) -> StackSampler:
+        # starts a sampling capture of the engine's threads that writes to path when it ends;
+        # asking again while one is running ends it early instead
+        if self._profiler is not None and self._profiler.is_alive():
+            self._profiler.stop()
+            return self._profiler
+        self._profiler = StackSampler(path, duration, daemon=True)
+        self._profiler.start()
+        return self._profiler
 
     def get_config(self) -> SmoothedScrollConfig:
         return self._listener.config
 
+    def pause(self) -> None:
+        self._listener.paused = True
+
+    def resume(self) -> None:
+        self._listener.paused = False
+
     def update_config(self, config: SmoothedScrollConfig) -> None:
-        self._listener.config = config
\ No newline at end of file
+        # the curves are built first, so a config they can't be built for raises before it is applied
+        self._warm_curves(config)
+        self._listener.config = config
+
+    def _warm_curves(self, config: SmoothedScrollConfig) -> None:
+        # build the tables up front so the first notch of a new config doesn't pay for it on the hook thread
+        for app_config in config.app_configs:
+            if app_config.scroll_config:
+                self._curves.get(app_config.scroll_config)
@@ -1,4 +1,7 @@
 from .easing_function import EasingFunction
-from .scroll_control import ScrollConfig, AppConfig, SmoothedScrollConfig, ScrollEvent
+from .app_config_matcher import AppConfigMatcher
+from .scroll_control import ScrollConfig, AppConfig, SmoothedScrollConfig, VK_SHIFT, VK_CONTROL, VK_MENU
+from .scroll_event_store import ScrollEvent, ScrollEventQueue, MergedAnimation, MergedEventStore
 from .timer_task import TimerTask
-from .mouse_hook import LowLevelMouseProc
+from .mouse_hook import LowLevelMouseProc, MOUSEINPUT, INPUT
+from .display_timing import DWM_TIMING_INFO
@@ -0,0 +1,65 @@
+import re
+from typing import Optional, Sequence
+
+MEMO_SIZE = 1024
+
+
+class AppConfigMatcher:
+    # resolves the ScrollConfig for an app path with the same precedence as scanning app_configs in order
+    # and letting the last match win: exact paths come from a dict, plain patterns are tried through one
+    # alternation ordered from the last AppConfig to the first, and results are memoized per path
+    def __init__(self, app_configs: Sequence):
+        self._app_configs = tuple(app_configs)
+        self._exact = {}
+        combinable = []
+        self._fallback = []
+
+        for index, app_config in enumerate(self._app_configs):
+            if app_config.path:
+                self._exact[app_config.path] = index
+            if app_config.regexp.pattern == r'<>':
+                continue  # the AppConfig default for "no pattern"
+            # groups would shift backreference numbers and inline flags must lead the pattern, so such
+            # patterns keep being matched one by one
+            if app_config.regexp.groups or app_config.regexp.flags & ~re.UNICODE:
+                self._fallback.append((index, app_config.regexp))
+            else:
+                combinable.append((index, app_config.regexp.pattern))
+
+        self._combined = None
+        if combinable:
+            self._combined = re.compile('|'.join(
+                f'(?P<_{index}>{pattern})' for index, pattern in reversed(combinable)
+            ))
+        self._fallback.reverse()
+        self._memo = {}
+
+    def match(self, path: str):
+        try:
+            return self._memo[path]
+        except KeyError:
+            pass
+
+        index = self._match_index(path)
+        scroll_config = self._app_configs[index].scroll_config if index is not None else None
+        if len(self._memo) >= MEMO_SIZE:
+            self._memo.clear()
+        self._memo[path] = scroll_config
+        return scroll_config
+
+    def _match_index(self, path: str) -> Optional[int]:
+        best = self._exact.get(path)
+
+        if self._combined and (match := self._combined.match(path)):
+            index = int(match.lastgroup[1:])
+            if best is None or index > best:
+                best = index
+
+        for index, regexp in self._fallback:
+            if best is not None and index <= best:
+                break
+            if regexp.match(path):
+                best = index
+                break
+
+        return best
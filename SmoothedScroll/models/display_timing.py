@@ -0,0 +1,56 @@
+import ctypes
+
+
+class UNSIGNED_RATIO(ctypes.Structure):
+    _pack_ = 1
+    _fields_ = [
+        ('numerator', ctypes.c_uint32),
+        ('denominator', ctypes.c_uint32),
+    ]
+
+
+# dwmapi.h declares its structures under pshpack1.h, hence _pack_ = 1
+class DWM_TIMING_INFO(ctypes.Structure):
+    _pack_ = 1
+    _fields_ = [
+        ('cbSize', ctypes.c_uint32),
+        ('rateRefresh', UNSIGNED_RATIO),
+        ('qpcRefreshPeriod', ctypes.c_uint64),
+        ('rateCompose', UNSIGNED_RATIO),
+        ('qpcVBlank', ctypes.c_uint64),
+        ('cRefresh', ctypes.c_uint64),
+        ('cDXRefresh', ctypes.c_uint),
+        ('qpcCompose', ctypes.c_uint64),
+        ('cFrame', ctypes.c_uint64),
+        ('cDXPresent', ctypes.c_uint),
+        ('cRefreshFrame', ctypes.c_uint64),
+        ('cFrameSubmitted', ctypes.c_uint64),
+        ('cDXPresentSubmitted', ctypes.c_uint),
+        ('cFrameConfirmed', ctypes.c_uint64),
+        ('cDXPresentConfirmed', ctypes.c_uint),
+        ('cRefreshConfirmed', ctypes.c_uint64),
+        ('cDXRefreshConfirmed', ctypes.c_uint),
+        ('cFramesLate', ctypes.c_uint64),
+        ('cFramesOutstanding', ctypes.c_uint),
+        ('cFrameDisplayed', ctypes.c_uint64),
+        ('qpcFrameDisplayed', ctypes.c_uint64),
+        ('cRefreshFrameDisplayed', ctypes.c_uint64),
+        ('cFrameComplete', ctypes.c_uint64),
+        ('qpcFrameComplete', ctypes.c_uint64),
+        ('cFramePending', ctypes.c_uint64),
+        ('qpcFramePending', ctypes.c_uint64),
+        ('cFramesDisplayed', ctypes.c_uint64),
+        ('cFramesComplete', ctypes.c_uint64),
+        ('cFramesPending', ctypes.c_uint64),
+        ('cFramesAvailable', ctypes.c_uint64),
+        ('cFramesDropped', ctypes.c_uint64),
+        ('cFramesMissed', ctypes.c_uint64),
+        ('cRefreshNextDisplayed', ctypes.c_uint64),
+        ('cRefreshNextPresented', ctypes.c_uint64),
+        ('cRefreshesDisplayed', ctypes.c_uint64),
+        ('cRefreshesPresented', ctypes.c_uint64),
+        ('cRefreshStarted', ctypes.c_uint64),
+        ('cPixelsReceived', ctypes.c_uint64),
+        ('cPixelsDrawn', ctypes.c_uint64),
+        ('cBuffersEmpty', ctypes.c_uint64),
+    ]
@@ -17,3 +17,22 @@ LowLevelMouseProc = ctypes.CFUNCTYPE(
     ctypes.wintypes.LPARAM,
     ctypes.POINTER(MSLLHOOKSTRUCT)
 )
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ('dx', ctypes.c_long),
+        ('dy', ctypes.c_long),
+        ('data', ctypes.c_int32),
+        ('flags', ctypes.wintypes.DWORD),
+        ('time', ctypes.wintypes.DWORD),
+        ('extra_info', ctypes.c_size_t),
+    ]
+
+
+class INPUT(ctypes.Structure):
+    # the keyboard and hardware members of the INPUT union are smaller than MOUSEINPUT, so they're left out
+    _fields_ = [
+        ('type', ctypes.wintypes.DWORD),
+        ('mi', MOUSEINPUT),
+    ]
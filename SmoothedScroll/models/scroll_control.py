@@ -1,10 +1,19 @@
 import re
-from time import perf_counter
 from typing import Optional, Union, Type, Literal, Iterable
-from win32con import VK_SHIFT, VK_CONTROL, VK_MENU
 from . import EasingFunction
+from .app_config_matcher import AppConfigMatcher
+
+# virtual-key codes from winuser.h, kept local so the models import without pywin32
+VK_SHIFT = 0x10
+VK_CONTROL = 0x11
+VK_MENU = 0x12
 
 class ScrollConfig:
+    __slots__ = (
+        'distance', 'acceleration', 'opposite_acceleration', 'acceleration_delta', 'acceleration_max',
+        'duration', 'pulse_scale', 'ease', 'inverted', 'horizontal_scroll_key', 'merge_impulses'
+    )
+
     def __init__(
             self,
             distance: Optional[Union[int, float]],
@@ -16,7 +25,8 @@ class ScrollConfig:
             pulse_scale: Union[int, float],
             ease: Type[EasingFunction],
             inverted: bool,
-            horizontal_scroll_key: Optional[Literal[VK_SHIFT, VK_CONTROL, VK_MENU]] = None
+            horizontal_scroll_key: Optional[Literal[VK_SHIFT, VK_CONTROL, VK_MENU]] = None,
+            merge_impulses: bool = False
     ):
         self.distance = distance
         self.acceleration = acceleration
@@ -28,9 +38,12 @@ class ScrollConfig:
         self.ease = ease
         self.inverted = inverted
         self.horizontal_scroll_key = horizontal_scroll_key
+        self.merge_impulses = merge_impulses
 
 
 class AppConfig:
+    __slots__ = ('path', 'regexp', 'enabled', 'scroll_config')
+
     def __init__(
             self,
             path: Optional[str] = None,
@@ -46,11 +59,7 @@ class AppConfig:
 class SmoothedScrollConfig:
     def __init__(self, app_config: Union[Iterable[AppConfig], AppConfig]):
         self.app_configs = tuple(app_config) if isinstance(app_config, Iterable) else (app_config,)
+        self.matcher = AppConfigMatcher(self.app_configs)
 
-class ScrollEvent:
-    def __init__(self, delta: int | float, is_horizontal: bool, config):
-        self.is_horizontal = is_horizontal
-        self.ease = config.ease(end=delta)
-        self.config = config
-        self.previous_delta = .0
-        self.start = perf_counter()
+    def match(self, path: str) -> Optional[ScrollConfig]:
+        return self.matcher.match(path)
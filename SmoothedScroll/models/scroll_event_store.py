@@ -0,0 +1,223 @@
+from typing import Callable, Tuple, Union
+
+
+class ScrollEvent:
+    __slots__ = ('delta', 'is_horizontal', 'duration', 'start', 'curve', 'previous')
+
+    def __init__(
+            self,
+            delta: Union[int, float],
+            is_horizontal: bool,
+            duration: Union[int, float],
+            start: float,
+            curve: Callable[[float], float]
+    ):
+        self.reset(delta, is_horizontal, duration, start, curve)
+
+    def reset(
+            self,
+            delta: Union[int, float],
+            is_horizontal: bool,
+            duration: Union[int, float],
+            start: float,
+            curve: Callable[[float], float]
+    ) -> None:
+        self.delta = delta
+        self.is_horizontal = is_horizontal
+        self.duration = duration
+        self.start = start
+        self.curve = curve
+        self.previous = 0
+
+
+class ScrollEventQueue:
+    # in-flight animations as a list of ScrollEvent records. The frame walks the records directly and only
+    # compacts the list on the frames where one finished, instead of copying it every frame and removing
+    # finished records one by one. Finished records go on a free list and are reset for the next impulse,
+    # so a steady wheel spin stops allocating once the list holds as many records as ever ran at once
+    def __init__(self):
+        self._events = []
+        self._free = []
+
+    def append(
+            self,
+            delta: Union[int, float],
+            is_horizontal: bool,
+            duration: Union[int, float],
+            start: float,
+            curve: Callable[[float], float]
+    ) -> None:
+        if self._free:
+            event = self._free.pop()
+            event.reset(delta, is_horizontal, duration, start, curve)
+        else:
+            event = ScrollEvent(delta, is_horizontal, duration, start, curve)
+        self._events.append(event)
+
+    def advance(self, current_time: float) -> Tuple[float, float]:
+        vertical_delta = horizontal_delta = 0
+        finished = False
+        for event in self._events:
+            elapsed = current_time - event.start
+            position = event.curve(elapsed) * event.delta
+            if event.is_horizontal:
+                horizontal_delta += position - event.previous
+            else:
+                vertical_delta += position - event.previous
+            event.previous = position
+            if elapsed >= event.duration:
+                finished = True
+
+        if finished:
+            events = self._events
+            kept = 0
+            for event in events:
+                if current_time - event.start < event.duration:
+                    events[kept] = event
+                    kept += 1
+                else:
+                    event.curve = None  # a pooled record shouldn't keep the curve of a replaced config alive
+                    self._free.append(event)
+            del events[kept:]
+
+        return vertical_delta, horizontal_delta
+
+    def peek(self, current_time: float) -> Tuple[float, float]:
+        # what advance(current_time) would return, without moving or dropping anything
+        vertical_delta = horizontal_delta = 0
+        for event in self._events:
+            step = event.curve(current_time - event.start) * event.delta - event.previous
+            if event.is_horizontal:
+                horizontal_delta += step
+            else:
+                vertical_delta += step
+        return vertical_delta, horizontal_delta
+
+    def end_time(self) -> float:
+        return max((event.start + event.duration for event in self._events), default=0)
+
+    def clear(self) -> None:
+        for event in self._events:
+            event.curve = None
+        self._free += self._events
+        self._events.clear()
+
+    def __len__(self):
+        return len(self._events)
+
+
+class MergedAnimation:
+    # one running animation per axis. A new impulse folds the rest of the running animation and its own delta
+    # into one stretch of the curve that leaves at the current speed and delivers the sum with the same mean
+    # delay as the separate animations would, so a wheel storm never grows the state and the output stays close
+    # to the stacked one
+    def __init__(self):
+        self.active = False
+        self._start = 0
+        self._duration = 0
+        self._curve = None
+        self._resume = 0
+        self._rate = 1
+        self._base = 0
+        self._scale = 0
+        self._offset = 0
+        self._previous = 0
+        self._target = 0
+
+    def add(self, delta: Union[int, float], duration: Union[int, float], start: float, curve) -> None:
+        base = self._previous
+        resume = 0
+        rate = 1
+        if self.active and start - self._start < self._duration:
+            elapsed = self._resume + (start - self._start) * self._rate
+            base = self._position(elapsed)
+            remaining = self._target - base
+            if remaining * delta > 0 and duration > 0:
+                span = remaining + delta
+                arrival = (
+                    remaining * self._curve.mean_arrival(elapsed) / self._rate + delta * curve.mean_arrival(0)
+                ) / span
+                if arrival > 0:
+                    speed = self._scale * self._rate * self._curve.slope(elapsed)
+                    resume = curve.resume_point(speed * arrival / span)
+                    rate = curve.mean_arrival(resume) / arrival or 1
+
+        self._offset = curve(resume)
+        self._target += delta
+        self._base = base
+        span = self._target - base
+        self._scale = span / (1 - self._offset) if self._offset < 1 else span
+        self._start = start
+        self._resume = resume
+        self._rate = rate
+        self._duration = (duration - resume) / rate
+        self._curve = curve
+        self.active = True
+
+    def _position(self, elapsed: float) -> float:
+        # elapsed is on the curve's own clock, which runs at _rate and starts at _resume
+        return self._base + self._scale * (self._curve(elapsed) - self._offset)
+
+    def advance(self, current_time: float) -> float:
+        if not self.active:
+            return 0
+
+        elapsed = current_time - self._start
+        if elapsed >= self._duration:
+            step = self._target - self._previous
+            self.clear()
+            return step
+
+        position = self._position(self._resume + elapsed * self._rate)
+        step = position - self._previous
+        self._previous = position
+        return step
+
+    def peek(self, current_time: float) -> float:
+        if not self.active:
+            return 0
+        elapsed = current_time - self._start
+        if elapsed >= self._duration:
+            return self._target - self._previous
+        return self._position(self._resume + elapsed * self._rate) - self._previous
+
+    def end_time(self) -> float:
+        return self._start + self._duration if self.active else 0
+
+    def clear(self) -> None:
+        self.active = False
+        self._curve = None
+        self._previous = self._target = 0
+
+
+class MergedEventStore:
+    # same interface as ScrollEventQueue, backed by one MergedAnimation per axis
+    def __init__(self):
+        self._vertical = MergedAnimation()
+        self._horizontal = MergedAnimation()
+
+    def append(
+            self,
+            delta: Union[int, float],
+            is_horizontal: bool,
+            duration: Union[int, float],
+            start: float,
+            curve: Callable[[float], float]
+    ) -> None:
+        (self._horizontal if is_horizontal else self._vertical).add(delta, duration, start, curve)
+
+    def advance(self, current_time: float) -> Tuple[float, float]:
+        return self._vertical.advance(current_time), self._horizontal.advance(current_time)
+
+    def peek(self, current_time: float) -> Tuple[float, float]:
+        return self._vertical.peek(current_time), self._horizontal.peek(current_time)
+
+    def end_time(self) -> float:
+        return max(self._vertical.end_time(), self._horizontal.end_time())
+
+    def clear(self) -> None:
+        self._vertical.clear()
+        self._horizontal.clear()
+
+    def __len__(self):
+        return self._vertical.active + self._horizontal.active
@@ -1,8 +1,23 @@
 from time import perf_counter
-from typing import Callable
+from typing import Callable, Optional
 
 class TimerTask:
-    def __init__(self, callback: Callable, timeout: int | float):
+    # tasks are heap entries themselves, ordered by deadline and then by scheduling order,
+    # so a task that is rescheduled every frame doesn't allocate a new entry each time
+    __slots__ = ('callback', 'timeout', 'start', 'deadline', 'cancelled', 'sequence')
+
+    def __init__(self, callback: Callable, timeout: int | float, start: Optional[float] = None):
         self.callback = callback
         self.timeout = timeout
-        self.start = perf_counter()
+        self.start = perf_counter() if start is None else start
+        self.deadline = self.start + timeout
+        self.cancelled = False
+        self.sequence = 0
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def __lt__(self, other: 'TimerTask') -> bool:
+        if self.deadline != other.deadline:
+            return self.deadline < other.deadline
+        return self.sequence < other.sequence
@@ -0,0 +1,196 @@
+import argparse
+import json
+import math
+from threading import Event
+from time import perf_counter
+from typing import Iterable, List, Union
+
+import easing_functions
+
+from .SmoothedScroll import SmoothedScroll, accelerate
+from .models import SmoothedScrollConfig, AppConfig, ScrollConfig
+from .utils import VirtualClock, VirtualTimer, RecordingSink, WheelEvent, read_trace, pulse
+
+
+class NullSource:
+    # stands in for MouseListener when events are fed straight into SmoothedScroll.scroll
+    def __init__(self, callback, config: SmoothedScrollConfig, *args, **kwargs):
+        self.callback = callback
+        self.config = config
+        self.paused = False
+        self._stop_event = Event()
+
+    def start(self):
+        pass
+
+    def listen(self):
+        self._stop_event.wait()
+
+    def join(self, timeout=None):
+        self._stop_event.set()
+
+
+def percentile(values: List[float], q: Union[int, float]) -> float:
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+class ReplayReport:
+    def __init__(self):
+        self.frame_times: List[float] = []
+        self.latencies: List[float] = []
+        self.errors: List[float] = []
+        self.final_error = 0.0
+        self.outputs = 0
+        self.injections = 0
+
+    def summary(self) -> dict:
+        return {
+            'frames': len(self.frame_times),
+            'outputs': self.outputs,
+            'injections': self.injections,
+            'frame_time_us': {
+                'mean': sum(self.frame_times) / len(self.frame_times) * 1e6 if self.frame_times else 0,
+                'p50': percentile(self.frame_times, 50) * 1e6,
+                'p99': percentile(self.frame_times, 99) * 1e6,
+                'max': max(self.frame_times, default=0) * 1e6,
+            },
+            'latency_ms': {
+                'mean': sum(self.latencies) / len(self.latencies) * 1e3 if self.latencies else 0,
+                'p50': percentile(self.latencies, 50) * 1e3,
+                'p99': percentile(self.latencies, 99) * 1e3,
+                'max': max(self.latencies, default=0) * 1e3,
+            },
+            'error': {
+                'max': max(self.errors, default=0),
+                'final': self.final_error,
+            },
+        }
+
+
+class Replay:
+    def __init__(self, config: ScrollConfig, display_frequency: int = 60, **engine_options):
+        self.config = config
+        # start past any acceleration_delta so the first event is not accelerated, as with perf_counter
+        self.clock = VirtualClock(start=1)
+        self.timer = VirtualTimer(self.clock)
+        self.sink = RecordingSink(self.clock)
+        self.engine = SmoothedScroll(
+            SmoothedScrollConfig(AppConfig(regexp=r'.*', scroll_config=config)),
+            clock=self.clock,
+            timer=self.timer,
+            source=NullSource,
+            sink=self.sink,
+            display_frequency=display_frequency,
+            **engine_options
+        )
+
+    def _run_frames(self, until: float, report: ReplayReport) -> None:
+        while (deadline := self.timer.next_deadline()) is not None and deadline <= until:
+            began = perf_counter()
+            self.timer.run_next()
+            report.frame_times.append(perf_counter() - began)
+        if until != math.inf:
+            self.clock.advance(until)
+
+    def run(self, events: Iterable[WheelEvent]) -> ReplayReport:
+        report = ReplayReport()
+        events = sorted(events, key=lambda event: event.time)
+        offset = self.clock()
+        first_output, first_injection = len(self.sink.calls), self.sink.injections
+        # the engine is never start()ed here, so its GC monitor, if any, only listens while the trace plays
+        gc_monitor = self.engine._gc_monitor
+        if gc_monitor:
+            gc_monitor.install()
+        try:
+            for event in events:
+                self._run_frames(offset + event.time, report)
+                self.engine._listener.callback(event.delta, event.is_horizontal, self.config)
+            self._run_frames(math.inf, report)
+        finally:
+            if gc_monitor:
+                gc_monitor.uninstall()
+
+        report.injections = self.sink.injections - first_injection
+        self._measure(events, offset, self.sink.calls[first_output:], report)
+        return report
+
+    def _ideal_position(self, impulses, time: float, is_horizontal: bool) -> float:
+        position = 0
+        for start, delta, horizontal in impulses:
+            if horizontal != is_horizontal or start > time:
+                continue
+            progress = (time - start) / self.config.duration if self.config.duration else 1
+            position += self.config.ease(end=delta)(pulse(progress, self.config.pulse_scale))
+        return position
+
+    def _measure(self, events: List[WheelEvent], offset: float, outputs: list, report: ReplayReport) -> None:
+        impulses = []
+        previous_time = 0
+        for event in events:
+            time = offset + event.time
+            impulses.append((time, accelerate(event.delta, time - previous_time, self.config), event.is_horizontal))
+            previous_time = time
+
+        report.outputs = len(outputs)
+
+        index = 0
+        for time, _, is_horizontal in impulses:
+            while index < len(outputs) and outputs[index][0] < time:
+                index += 1
+            first = next((output for output in outputs[index:] if output[2] == is_horizontal), None)
+            if first:
+                report.latencies.append(first[0] - time)
+
+        emitted = {False: 0, True: 0}
+        for time, delta, is_horizontal in outputs:
+            emitted[is_horizontal] += delta
+            report.errors.append(abs(emitted[is_horizontal] - self._ideal_position(impulses, time, is_horizontal)))
+
+        report.final_error = max(
+            abs(emitted[axis] - sum(delta for _, delta, horizontal in impulses if horizontal == axis))
+            for axis in (False, True)
+        )
+
+
+def replay(
+        events: Iterable[WheelEvent],
+        config: ScrollConfig,
+        display_frequency: int = 60,
+        **engine_options
+) -> ReplayReport:
+    return Replay(config, display_frequency, **engine_options).run(events)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a wheel trace through SmoothedScroll on a virtual clock')
+    parser.add_argument('trace')
+    parser.add_argument('--frequency', type=int, default=60)
+    parser.add_argument('--distance', type=float, default=120)
+    parser.add_argument('--acceleration', type=float, default=1.0)
+    parser.add_argument('--opposite-acceleration', type=float, default=1.2)
+    parser.add_argument('--acceleration-delta', type=float, default=70)
+    parser.add_argument('--acceleration-max', type=float, default=14)
+    parser.add_argument('--duration', type=float, default=500)
+    parser.add_argument('--pulse-scale', type=float, default=3.0)
+    args = parser.parse_args()
+
+    config = ScrollConfig(
+        distance=args.distance,
+        acceleration=args.acceleration,
+        opposite_acceleration=args.opposite_acceleration,
+        acceleration_delta=args.acceleration_delta,
+        acceleration_max=args.acceleration_max,
+        duration=args.duration,
+        pulse_scale=args.pulse_scale,
+        ease=easing_functions.LinearInOut,
+        inverted=False
+    )
+    report = replay(read_trace(args.trace), config, args.frequency)
+    print(json.dumps(report.summary(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
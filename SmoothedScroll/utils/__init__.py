@@ -1,2 +1,29 @@
-from .timer_thread import Timer
-from .scroll_listener import MouseListener, scroll, get_current_app_path, get_display_frequency, set_console_ctrl_handler
+from .timer_thread import Timer, TIMER_SPIN
+from .virtual_timer import VirtualClock, VirtualTimer
+from .blocklist import BlocklistWatcher, blocklist_name, blocklist_names
+from .control import ControlChannel
+from .app_path_cache import AppQuery, AppPathCache
+from .histogram import Histogram, geometric_bounds
+from .ring_buffer import WheelRing
+from .metrics import EngineMetrics
+from .gc_monitor import GcPauseMonitor
+from .profiler import StackSampler
+from .telemetry import TelemetrySample, TelemetryRing
+from .hook_watchdog import HookHost, HookWatchdog, HOOK_BUDGET, HOOK_TIMEOUT
+from .output_sink import OutputSink, CallbackSink, RecordingSink
+from .refresh_rate import RefreshRateProvider, StaticRefreshRate, DisplayQuery, CachedRefreshRate
+from .curves import CurveTable, CurveCache, pulse
+from .trace import WheelEvent, TraceRecorder, read_trace, write_trace, generate_trace
+
+_SCROLL_LISTENER_NAMES = (
+    'MouseListener', 'scroll', 'get_current_app_path', 'get_display_frequency', 'set_console_ctrl_handler',
+    'Win32AppQuery', 'Win32DisplayQuery', 'Win32HookHost', 'SendInputSink'
+)
+
+
+def __getattr__(name):
+    # the win32 layer is imported on first use so the engine can run headless on other platforms
+    if name in _SCROLL_LISTENER_NAMES:
+        from . import scroll_listener
+        return getattr(scroll_listener, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
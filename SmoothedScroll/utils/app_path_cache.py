@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from time import perf_counter
+from typing import Any, Callable, Union
+
+
+class AppQuery:
+    # the OS calls AppPathCache needs; Win32AppQuery in scroll_listener implements them with pywin32
+    def cursor_window(self) -> int:
+        raise NotImplementedError
+
+    def window_pid(self, hwnd: int) -> int:
+        raise NotImplementedError
+
+    def open_process(self, pid: int) -> Any:
+        raise NotImplementedError
+
+    def process_path(self, handle: Any) -> str:
+        raise NotImplementedError
+
+    def has_exited(self, handle: Any) -> bool:
+        raise NotImplementedError
+
+    def close(self, handle: Any) -> None:
+        raise NotImplementedError
+
+
+class AppPathCache:
+    # hwnd -> pid -> normalized exe path. The process handle stays open while a pid is cached, which keeps
+    # Windows from reusing the pid; whether the process has exited is only re-checked every revalidate seconds
+    def __init__(
+            self,
+            query: AppQuery,
+            max_windows: int = 256,
+            max_processes: int = 64,
+            revalidate: Union[int, float] = 1.0,
+            clock: Callable[[], float] = perf_counter
+    ):
+        self._query = query
+        self._max_windows = max_windows
+        self._max_processes = max_processes
+        self._revalidate = revalidate
+        self._clock = clock
+        self._windows = OrderedDict()
+        self._processes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def current_app_path(self) -> str:
+        return self.app_path(self._query.cursor_window())
+
+    def app_path(self, hwnd: int) -> str:
+        # both maps are LRU: a hit moves its window and process to the end, eviction pops from the front
+        pid = self._windows.get(hwnd)
+        if pid is None:
+            pid = self._windows[hwnd] = self._query.window_pid(hwnd)
+            if len(self._windows) > self._max_windows:
+                self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(hwnd)
+
+        entry = self._processes.get(pid)
+        if entry is not None:
+            if self._clock() < entry[2] or not self._is_stale(pid, entry):
+                return self._hit(pid, entry)
+            # the process behind this window exited, so the window may now belong to someone else
+            pid = self._windows[hwnd] = self._query.window_pid(hwnd)
+            entry = self._processes.get(pid)
+            if entry is not None:
+                return self._hit(pid, entry)
+
+        self.misses += 1
+        handle = self._query.open_process(pid)
+        path = self._query.process_path(handle).replace('\\', r'/')
+        self._processes[pid] = [handle, path, self._clock() + self._revalidate]
+        if len(self._processes) > self._max_processes:
+            self._forget(next(iter(self._processes)))
+        return path
+
+    def _hit(self, pid: int, entry: list) -> str:
+        self.hits += 1
+        self._processes.move_to_end(pid)
+        return entry[1]
+
+    def _is_stale(self, pid: int, entry: list) -> bool:
+        if self._query.has_exited(entry[0]):
+            self.invalidations += 1
+            self._forget(pid)
+            return True
+        entry[2] = self._clock() + self._revalidate
+        return False
+
+    def _forget(self, pid: int) -> None:
+        handle, _, _ = self._processes.pop(pid)
+        self._query.close(handle)
+        for hwnd in [hwnd for hwnd, window_pid in self._windows.items() if window_pid == pid]:
+            del self._windows[hwnd]
+
+    def clear(self) -> None:
+        for pid in list(self._processes):
+            self._forget(pid)
+        self._windows.clear()
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'windows': len(self._windows),
+            'processes': len(self._processes),
+        }
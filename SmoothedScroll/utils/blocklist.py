@@ -0,0 +1,62 @@
+import json
+import os
+from threading import Thread, Event
+from typing import Iterable, Optional, Union
+
+
+def blocklist_name(name: str) -> str:
+    # the one form blocklist entries are stored and compared in; Windows file names ignore case, while the
+    # process table and the Steam scan report them as they were written
+    return str(name).lower()
+
+
+def blocklist_names(names: Iterable) -> list:
+    # blocklist_name over a whole list, inlined since the file is normalised on every read and write. Names
+    # that only differed in case become duplicates, which the watcher's set and toggle_blocklist both absorb
+    return [str(name).lower() for name in names]
+
+
+class BlocklistWatcher(Thread):
+    # keeps a frozenset of blocked exe names (lowercase) in sync with the blocklist file; the file is only
+    # ever read on this thread, after its mtime or size changes, and the set is swapped in as a whole
+    def __init__(self, path: Optional[str], interval: Union[int, float] = 1.0, *args: object, **kwargs: object):
+        super().__init__(*args, **kwargs)
+        self.path = path
+        self.interval = interval
+        self.blocked = frozenset()
+        self._signature = None
+        self._stop_event = Event()
+        self.reload()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.reload()
+
+    def reload(self) -> bool:
+        try:
+            stat = os.stat(self.path)
+        except (OSError, TypeError):
+            signature = None
+        else:
+            signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return False
+
+        self._signature = signature
+        self.blocked = frozenset(blocklist_names(self._load())) if signature else frozenset()
+        return True
+
+    def _load(self) -> list:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                blocklist = json.loads(file.read().strip() or '[]')
+        except (OSError, ValueError):
+            return []
+        return [str(name) for name in blocklist] if isinstance(blocklist, list) else []
+
+    def is_blocked(self, path: str) -> bool:
+        # takes a full path or just the exe name
+        return blocklist_name(path[path.rfind('/') + 1:]) in self.blocked
+
+    def stop(self) -> None:
+        self._stop_event.set()
@@ -0,0 +1,41 @@
+import traceback
+from threading import Thread
+from typing import Callable, Dict
+
+
+class ControlChannel(Thread):
+    # receives (command, payload, reply) tuples from the settings process over a multiprocessing Pipe.
+    # Commands run on the timer thread so they land between frames; when reply is set the result is
+    # acknowledged with ('done', command) once applied, or ('error', command, message) when the handler raised.
+    # 'stop', or the other end going away, shuts down
+    def __init__(self, connection, handlers: Dict[str, Callable], timer, *args: object, **kwargs: object):
+        super().__init__(*args, **kwargs)
+        self._connection = connection
+        self._handlers = handlers
+        self._timer = timer
+
+    def run(self):
+        self._connection.send(('ready', None))
+        while True:
+            try:
+                command, payload, reply = self._connection.recv()
+            except (EOFError, OSError):
+                command, payload, reply = 'stop', None, False
+            if command == 'stop':
+                self._handlers['stop'](payload)
+                return
+            self._timer.set_timeout(lambda c=command, p=payload, r=reply: self._apply(c, p, r), 0)
+
+    def _apply(self, command: str, payload, reply: bool) -> None:
+        handler = self._handlers.get(command)
+        try:
+            if handler:
+                handler(payload)
+        except Exception as e:
+            # a rejected command must not take the timer thread, and with it every frame, down
+            traceback.print_exc()
+            if reply:
+                self._connection.send(('error', command, f'{type(e).__name__}: {e}'))
+            return
+        if reply:
+            self._connection.send(('done' if handler else 'unknown', command))
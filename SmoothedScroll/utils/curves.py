@@ -0,0 +1,127 @@
+import math
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from itertools import accumulate
+from typing import Type, Union
+
+from ..models import EasingFunction, ScrollConfig
+
+CURVE_SAMPLES = 1024
+CURVE_CACHE_SIZE = 32
+
+
+def _raw_pulse(x_scaled: float) -> float:
+    if x_scaled < 1:
+        return x_scaled - (1 - math.exp(-x_scaled))
+    start = math.exp(-1)
+    return start + ((1 - math.exp(-x_scaled + 1)) * (1 - start))
+
+
+def pulse(x: Union[int, float], scale: Union[int, float]) -> float:
+    if x >= 1:
+        return 1
+    if x <= 0:
+        return 0
+    return _raw_pulse(x * scale) / _raw_pulse(scale)
+
+
+class CurveTable:
+    # samples ease(pulse(elapsed / duration)) for a unit delta, so a frame only interpolates between two entries
+    def __init__(
+            self,
+            pulse_scale: Union[int, float],
+            ease: Type[EasingFunction],
+            duration: Union[int, float],
+            samples: int = CURVE_SAMPLES
+    ):
+        self.duration = duration
+        # elapsed time of the steepest point of the pulse, the latest a merged animation resumes after a new impulse
+        self.peak = duration * min(1 / pulse_scale, 0.5) if pulse_scale > 0 else 0
+        easing = ease(end=1)
+        self._values = array('d', (easing(pulse(i / samples, pulse_scale)) for i in range(samples + 1)))
+        self._values.append(self._values[-1])  # pad so interpolation at the last sample stays in bounds
+        self._end = self._values[samples]
+        self._samples_per_second = samples / duration if duration > 0 else 0
+        self._samples = samples
+        # built on the first merged impulse, so a config that doesn't merge doesn't pay for them on its first notch
+        self._arrivals = self._resume_ratios = None
+
+    def _merge_tables(self):
+        # per sample, the mean time until the rest of a unit delta arrives, and the speed of the rest of the curve
+        # times that time over the distance left, which only grows up to the peak; MergedAnimation re-targets with them
+        values = self._values
+        samples = self._samples
+        step = self.duration / samples
+        remaining = [1 - values[i] for i in range(samples + 1)]
+        tails = list(accumulate(
+            ((remaining[i] + remaining[i + 1]) / 2 * step for i in reversed(range(samples))), initial=0
+        ))[::-1]
+        arrivals = array('d', (tail / left if left > 0 else 0 for tail, left in zip(tails, remaining)))
+        arrivals.append(0)
+        ratios = [
+            (values[i + 1] - values[i]) * self._samples_per_second * arrivals[i] / remaining[i]
+            if remaining[i] > 0 else math.inf
+            for i in range(int(self.peak * self._samples_per_second) + 1)
+        ]
+        self._arrivals = arrivals
+        self._resume_ratios = array('d', accumulate(ratios, max))
+
+    def __call__(self, elapsed: Union[int, float]) -> float:
+        if elapsed >= self.duration:
+            return self._end
+        if elapsed <= 0:
+            return self._values[0]
+
+        position = elapsed * self._samples_per_second
+        index = int(position)
+        start = self._values[index]
+        return start + (self._values[index + 1] - start) * (position - index)
+
+    def slope(self, elapsed: Union[int, float]) -> float:
+        if elapsed >= self.duration or elapsed < 0:
+            return 0
+        index = int(elapsed * self._samples_per_second)
+        return (self._values[index + 1] - self._values[index]) * self._samples_per_second
+
+    def mean_arrival(self, elapsed: Union[int, float]) -> float:
+        # mean time from elapsed until the part of a unit delta still to come has arrived
+        if elapsed >= self.duration:
+            return 0
+        if self._arrivals is None:
+            self._merge_tables()
+        position = max(elapsed, 0) * self._samples_per_second
+        index = int(position)
+        start = self._arrivals[index]
+        return start + (self._arrivals[index + 1] - start) * (position - index)
+
+    def resume_point(self, ratio: float) -> float:
+        # the earliest elapsed time, up to the peak, from which the rest of the curve leaves at least ratio times
+        # the distance left over its mean arrival time
+        if self._resume_ratios is None:
+            self._merge_tables()
+        index = min(bisect_left(self._resume_ratios, ratio), len(self._resume_ratios) - 1)
+        return index / self._samples_per_second if self._samples_per_second else 0
+
+
+class CurveCache:
+    def __init__(self, maxsize: int = CURVE_CACHE_SIZE):
+        self._maxsize = maxsize
+        self._tables = OrderedDict()
+
+    def get(self, config: ScrollConfig) -> CurveTable:
+        key = (config.pulse_scale, config.ease, config.duration)
+        table = self._tables.get(key)
+        if table is None:
+            table = self._tables[key] = CurveTable(*key)
+            if len(self._tables) > self._maxsize:
+                self._tables.popitem(last=False)
+        else:
+            self._tables.move_to_end(key)
+        return table
+
+    def clear(self) -> None:
+        self._tables.clear()
+
+    def __len__(self):
+        return len(self._tables)
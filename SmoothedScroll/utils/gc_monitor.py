@@ -0,0 +1,46 @@
+import gc
+from time import perf_counter
+from typing import Callable
+
+from .histogram import Histogram, geometric_bounds
+
+GC_PAUSE_BOUNDS = geometric_bounds(1e-5, 0.1, 16)
+
+
+class GcPauseMonitor:
+    # times every cyclic collection through gc.callbacks and keeps the ones that ran while an animation
+    # was in flight apart, since those are the pauses that can land between two frames
+    def __init__(self, is_animating: Callable[[], bool], clock: Callable[[], float] = perf_counter):
+        self._is_animating = is_animating
+        self._clock = clock
+        self._started = None
+        self.pauses = Histogram(GC_PAUSE_BOUNDS)
+        self.animation_pauses = Histogram(GC_PAUSE_BOUNDS)
+        self.deferred = 0
+
+    def install(self) -> None:
+        if self._callback not in gc.callbacks:
+            gc.callbacks.append(self._callback)
+
+    def uninstall(self) -> None:
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+    def _callback(self, phase: str, info: dict) -> None:
+        if phase == 'start':
+            self._started = self._clock()
+            return
+        if self._started is None:
+            return
+        pause = self._clock() - self._started
+        self._started = None
+        self.pauses.record(pause)
+        if self._is_animating():
+            self.animation_pauses.record(pause)
+
+    def as_dict(self) -> dict:
+        return {
+            'pauses': self.pauses.as_dict(),
+            'animation_pauses': self.animation_pauses.as_dict(),
+            'deferred': self.deferred,
+        }
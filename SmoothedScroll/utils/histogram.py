@@ -0,0 +1,55 @@
+from array import array
+from bisect import bisect_left
+from typing import Sequence, Union
+
+
+def geometric_bounds(low: float, high: float, count: int) -> tuple:
+    ratio = (high / low) ** (1 / (count - 1))
+    return tuple(low * ratio ** i for i in range(count))
+
+
+class Histogram:
+    # fixed buckets chosen up front so recording is a bisect and an increment, with no allocation
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = array('Q', bytes(8 * (len(self.bounds) + 1)))  # the last bucket holds overflow
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: Union[int, float]) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: Union[int, float]) -> float:
+        # upper bound of the bucket holding the q-th percentile, or the max for the overflow bucket
+        if not self.count:
+            return 0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return self.max
+
+    def reset(self) -> None:
+        for index in range(len(self.counts)):
+            self.counts[index] = 0
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def as_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.max,
+            'bounds': list(self.bounds),
+            'counts': list(self.counts),
+        }
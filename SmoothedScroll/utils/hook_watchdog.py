@@ -0,0 +1,101 @@
+from threading import Thread, Event
+from typing import Any, Callable, Union
+
+HOOK_BUDGET = 0.01  # hook callbacks slower than this are counted against the latency budget
+HOOK_TIMEOUT = 0.3  # the default LowLevelHooksTimeout; past it Windows may drop the hook without telling anyone
+
+
+class HookHost:
+    # the OS side HookWatchdog drives; Win32HookHost in scroll_listener implements it for WH_MOUSE_LL
+    def install(self) -> None:
+        # only ever called on the listener thread, whose message loop the hook is tied to
+        raise NotImplementedError
+
+    def uninstall(self) -> None:
+        raise NotImplementedError
+
+    def pointer_position(self) -> Any:
+        # anything that changes whenever the mouse moves, or None while it can't be read
+        raise NotImplementedError
+
+    def call_on_listener(self, function: Callable[[], None]) -> None:
+        # runs function on the listener thread, from any thread
+        raise NotImplementedError
+
+
+class HookWatchdog(Thread):
+    # the hook reports every callback's duration through record(); a callback that overran the system timeout,
+    # or a pointer that moved while the hook saw nothing for a whole interval, means Windows may have silently
+    # unhooked it, so it is reinstalled on the listener thread. Every incident is counted
+    def __init__(
+            self,
+            host: HookHost,
+            budget: Union[int, float] = HOOK_BUDGET,
+            timeout: Union[int, float] = HOOK_TIMEOUT,
+            interval: Union[int, float] = 0.25,
+            *args: object,
+            **kwargs: object
+    ):
+        super().__init__(*args, **kwargs)
+        self.host = host
+        self.budget = budget
+        self.timeout = timeout
+        self.interval = interval
+        self.callbacks = 0
+        self.over_budget = 0
+        self.timeouts = 0
+        self.quiet = 0
+        self.reinstalls = 0
+        self._checked_callbacks = 0
+        self._position = None
+        self._reinstall_pending = False
+        self._stop_event = Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.check()
+
+    def record(self, duration: float) -> None:
+        # runs on the listener thread at the end of every hook callback
+        self.callbacks += 1
+        if duration > self.budget:
+            self.over_budget += 1
+            if duration > self.timeout:
+                self.timeouts += 1
+                self._request_reinstall()
+
+    def check(self) -> bool:
+        # True when the hook went quiet: the pointer moved since the last check but no callback ran
+        position = self.host.pointer_position()
+        moved = position is not None and self._position is not None and position != self._position
+        self._position = position
+        callbacks, self._checked_callbacks = self._checked_callbacks, self.callbacks
+        if not moved or callbacks != self.callbacks or self._reinstall_pending:
+            return False
+        self.quiet += 1
+        self._request_reinstall()
+        return True
+
+    def _request_reinstall(self) -> None:
+        if not self._reinstall_pending:
+            self._reinstall_pending = True
+            self.host.call_on_listener(self.reinstall)
+
+    def reinstall(self) -> None:
+        self.host.uninstall()
+        self.host.install()
+        self.reinstalls += 1
+        self._position = None  # movement before the new hook went in says nothing about it
+        self._reinstall_pending = False
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def stats(self) -> dict:
+        return {
+            'callbacks': self.callbacks,
+            'over_budget': self.over_budget,
+            'timeouts': self.timeouts,
+            'quiet': self.quiet,
+            'reinstalls': self.reinstalls,
+        }
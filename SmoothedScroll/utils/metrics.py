@@ -0,0 +1,66 @@
+import json
+from time import time
+from typing import Optional
+
+from .histogram import Histogram, geometric_bounds
+
+FRAME_TIME_BOUNDS = geometric_bounds(1e-6, 0.01, 16)
+LATENESS_BOUNDS = geometric_bounds(1e-5, 0.05, 16)
+LATENCY_BOUNDS = geometric_bounds(1e-4, 0.1, 16)
+COUNT_BOUNDS = tuple(2 ** i for i in range(11))
+CARRY_BOUNDS = tuple(i / 10 for i in range(1, 10))
+
+
+class EngineMetrics:
+    def __init__(self):
+        self.frames = 0
+        self.animations = 0
+        self.emits = 0
+        self.frame_time = Histogram(FRAME_TIME_BOUNDS)
+        self.lateness = Histogram(LATENESS_BOUNDS)
+        self.concurrency = Histogram(COUNT_BOUNDS)
+        self.carry = Histogram(CARRY_BOUNDS)
+        self.first_emit_latency = Histogram(LATENCY_BOUNDS)
+        self.frames_per_animation = Histogram(COUNT_BOUNDS)
+        self._animation_frames = 0
+        self._first_unemitted_input: Optional[float] = None
+
+    def input(self, time: float) -> None:
+        if self._first_unemitted_input is None:
+            self._first_unemitted_input = time
+
+    def frame(self, lateness: float, compute_time: float, concurrency: int, carry_x: float, carry_y: float) -> None:
+        self.frames += 1
+        self._animation_frames += 1
+        self.lateness.record(lateness)
+        self.frame_time.record(compute_time)
+        self.concurrency.record(concurrency)
+        self.carry.record(max(abs(carry_x), abs(carry_y)))
+
+    def emit(self, time: float) -> None:
+        self.emits += 1
+        if self._first_unemitted_input is not None:
+            self.first_emit_latency.record(time - self._first_unemitted_input)
+            self._first_unemitted_input = None
+
+    def animation_end(self) -> None:
+        self.animations += 1
+        self.frames_per_animation.record(self._animation_frames)
+        self._animation_frames = 0
+
+    def as_dict(self) -> dict:
+        return {
+            'frames': self.frames,
+            'animations': self.animations,
+            'emits': self.emits,
+            'frame_time': self.frame_time.as_dict(),
+            'lateness': self.lateness.as_dict(),
+            'concurrency': self.concurrency.as_dict(),
+            'carry': self.carry.as_dict(),
+            'first_emit_latency': self.first_emit_latency.as_dict(),
+            'frames_per_animation': self.frames_per_animation.as_dict(),
+        }
+
+    def export(self, path: str, **extra) -> None:
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps({'time': time(), **self.as_dict(), **extra}) + '\n')
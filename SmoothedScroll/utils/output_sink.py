@@ -0,0 +1,34 @@
+from typing import Callable, List, Tuple
+
+
+class OutputSink:
+    # receives one frame's integer wheel deltas for both axes; only called when at least one is non-zero
+    def emit(self, vertical: int, horizontal: int) -> None:
+        raise NotImplementedError
+
+
+class CallbackSink(OutputSink):
+    # adapts a per-axis scroll(delta, is_horizontal) callable
+    def __init__(self, callback: Callable[[int, bool], None]):
+        self._callback = callback
+
+    def emit(self, vertical: int, horizontal: int) -> None:
+        if vertical:
+            self._callback(vertical, False)
+        if horizontal:
+            self._callback(horizontal, True)
+
+
+class RecordingSink(OutputSink):
+    def __init__(self, clock: Callable[[], float]):
+        self._clock = clock
+        self.injections = 0
+        self.calls: List[Tuple[float, int, bool]] = []
+
+    def emit(self, vertical: int, horizontal: int) -> None:
+        self.injections += 1
+        time = self._clock()
+        if vertical:
+            self.calls.append((time, vertical, False))
+        if horizontal:
+            self.calls.append((time, horizontal, True))
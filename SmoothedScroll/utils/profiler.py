@@ -0,0 +1,91 @@
+import os
+import sys
+import threading
+from threading import Thread, Event
+from time import perf_counter
+from typing import Optional, Union
+
+MAX_STACKS = 5000
+MAX_DEPTH = 64
+
+
+class StackSampler(Thread):
+    # a sampling profiler for the running engine: every interval it walks the current stack of each other thread
+    # (hook, timer, control, ...) with sys._current_frames() instead of tracing every call like cProfile. Distinct
+    # stacks are capped at max_stacks, and the capture ends by itself after duration seconds, writing collapsed
+    # stacks ("thread;outer;...;inner count" lines) that flamegraph.pl and speedscope read
+    def __init__(
+            self,
+            path: str,
+            duration: Union[int, float] = 10,
+            interval: Union[int, float] = 0.001,
+            max_stacks: int = MAX_STACKS,
+            max_depth: int = MAX_DEPTH,
+            *args: object,
+            **kwargs: object
+    ):
+        super().__init__(*args, **kwargs)
+        self.path = path
+        self.duration = duration
+        self.interval = interval
+        self.max_stacks = max_stacks
+        self.max_depth = max_depth
+        self.samples = 0
+        self.dropped = 0
+        self._counts = {}
+        self._names = {}
+        self._stop_event = Event()
+
+    def run(self):
+        end = perf_counter() + self.duration
+        while not self._stop_event.wait(self.interval) and perf_counter() < end:
+            self.sample()
+        self.write()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def sample(self) -> None:
+        own = threading.get_ident()
+        counts = self._counts
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            # code objects are kept as they are and only formatted once, when the capture is written
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            key = (ident, tuple(stack))
+            self.samples += 1
+            if key in counts:
+                counts[key] += 1
+            elif len(counts) < self.max_stacks:
+                counts[key] = 1
+                if ident not in self._names:
+                    self._names[ident] = self._thread_name(ident)
+            else:
+                self.dropped += 1
+
+    @staticmethod
+    def _thread_name(ident: int) -> str:
+        return next((thread.name for thread in threading.enumerate() if thread.ident == ident), str(ident))
+
+    def write(self) -> Optional[str]:
+        if not self.path:
+            return None
+        lines = {}
+        for (ident, stack), count in self._counts.items():
+            frames = [self._names.get(ident, str(ident))]
+            frames.extend(
+                f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+                for code in reversed(stack)
+            )
+            line = ';'.join(frames)
+            lines[line] = lines.get(line, 0) + count
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            for line, count in sorted(lines.items()):
+                file.write(f'{line} {count}\n')
+        os.replace(temp_path, self.path)
+        return self.path
@@ -0,0 +1,65 @@
+from time import perf_counter
+from typing import Any, Callable, Optional, Union
+
+FALLBACK_FREQUENCY = 60
+
+
+class RefreshRateProvider:
+    def frequency(self) -> float:
+        raise NotImplementedError
+
+    def last_vblank(self) -> Optional[float]:
+        # time of a recent vertical blank on the engine clock, or None when the display's phase is unknown
+        return None
+
+    def invalidate(self) -> None:
+        pass
+
+
+class StaticRefreshRate(RefreshRateProvider):
+    def __init__(self, frequency: Union[int, float]):
+        self._frequency = frequency
+
+    def frequency(self) -> float:
+        return self._frequency
+
+
+class DisplayQuery:
+    # the OS calls CachedRefreshRate needs; Win32DisplayQuery in scroll_listener implements them
+    def current_monitor(self) -> Any:
+        raise NotImplementedError
+
+    def monitor_frequency(self, monitor: Any) -> int:
+        raise NotImplementedError
+
+    def last_vblank(self) -> Optional[float]:
+        return None
+
+
+class CachedRefreshRate(RefreshRateProvider):
+    # refresh rate of the monitor under the cursor, cached per monitor until a display change is
+    # reported through invalidate(); entries also expire after ttl seconds since VRR and power-saving
+    # switches don't always broadcast a display change
+    def __init__(self, query: DisplayQuery, ttl: Union[int, float] = 5, clock: Callable[[], float] = perf_counter):
+        self._query = query
+        self._ttl = ttl
+        self._clock = clock
+        self._frequencies = {}
+
+    def frequency(self) -> float:
+        monitor = self._query.current_monitor()
+        entry = self._frequencies.get(monitor)
+        if entry is not None and self._clock() < entry[1]:
+            return entry[0]
+
+        frequency = self._query.monitor_frequency(monitor)
+        if frequency <= 1:  # 0 and 1 mean "hardware default"
+            frequency = FALLBACK_FREQUENCY
+        self._frequencies[monitor] = (frequency, self._clock() + self._ttl)
+        return frequency
+
+    def last_vblank(self) -> Optional[float]:
+        return self._query.last_vblank()
+
+    def invalidate(self) -> None:
+        self._frequencies.clear()
@@ -0,0 +1,44 @@
+from array import array
+from typing import Optional, Tuple, Union
+
+
+class WheelRing:
+    # single-producer/single-consumer ring of preallocated slots: the hook thread only ever writes _tail,
+    # the animation thread only ever writes _head, so neither side takes a lock
+    def __init__(self, capacity: int = 256):
+        if capacity & (capacity - 1):
+            raise ValueError('capacity must be a power of two')
+        self._mask = capacity - 1
+        self._time = array('d', bytes(8 * capacity))
+        self._delta = array('d', bytes(8 * capacity))
+        self._horizontal = array('b', bytes(capacity))
+        self._config = [None] * capacity
+        self._head = 0
+        self._tail = 0
+        self.drops = 0
+
+    def push(self, time: float, delta: Union[int, float], is_horizontal: bool, config) -> bool:
+        tail = self._tail
+        if tail - self._head > self._mask:
+            self.drops += 1
+            return False
+        index = tail & self._mask
+        self._time[index] = time
+        self._delta[index] = delta
+        self._horizontal[index] = is_horizontal
+        self._config[index] = config
+        self._tail = tail + 1  # publish only once the slot is fully written
+        return True
+
+    def pop(self) -> Optional[Tuple[float, bool, object, float]]:
+        head = self._head
+        if head == self._tail:
+            return None
+        index = head & self._mask
+        event = self._delta[index], bool(self._horizontal[index]), self._config[index], self._time[index]
+        self._config[index] = None
+        self._head = head + 1
+        return event
+
+    def __len__(self):
+        return self._tail - self._head
@@ -1,54 +1,105 @@
-from ctypes import WinDLL, c_int
+from collections import deque
+from ctypes import WinDLL, c_int, c_int64, c_uint, sizeof, byref
 from ctypes.wintypes import MSG
 from threading import Thread, Event
-from typing import Callable
+from time import perf_counter
+from typing import Callable, Optional
 
-from win32api import GetAsyncKeyState, mouse_event, OpenProcess, CloseHandle, EnumDisplaySettings, SetConsoleCtrlHandler
-from win32con import WH_MOUSE_LL, WM_MOUSEWHEEL, WM_QUIT, MOUSEEVENTF_HWHEEL, MOUSEEVENTF_WHEEL, MAXIMUM_ALLOWED
-from win32gui import GetCursorPos, WindowFromPoint
+from win32api import (
+    GetAsyncKeyState, mouse_event, OpenProcess, CloseHandle, EnumDisplaySettings, SetConsoleCtrlHandler,
+    MonitorFromPoint, GetMonitorInfo, GetModuleHandle
+)
+from win32con import (
+    WH_MOUSE_LL, WM_MOUSEWHEEL, WM_QUIT, WM_APP, WM_DISPLAYCHANGE, MOUSEEVENTF_HWHEEL, MOUSEEVENTF_WHEEL, MAXIMUM_ALLOWED,
+    MONITOR_DEFAULTTONEAREST, ENUM_CURRENT_SETTINGS
+)
+from win32event import WaitForSingleObject, WAIT_OBJECT_0
+from pywintypes import error as Win32Error
+from win32gui import GetCursorPos, WindowFromPoint, WNDCLASS, RegisterClass, CreateWindow, DestroyWindow
 from win32process import GetWindowThreadProcessId, GetModuleFileNameEx
 
-from ..models import SmoothedScrollConfig, LowLevelMouseProc
+from ..models import SmoothedScrollConfig, LowLevelMouseProc, INPUT, DWM_TIMING_INFO
+from .app_path_cache import AppQuery, AppPathCache
+from .blocklist import BlocklistWatcher
+from .histogram import Histogram, geometric_bounds
+from .hook_watchdog import HookHost, HookWatchdog, HOOK_BUDGET
+from .refresh_rate import DisplayQuery
+from .output_sink import OutputSink
 
 user32 = WinDLL('user32', use_last_error=True)
+dwmapi = WinDLL('dwmapi')
+kernel32 = WinDLL('kernel32')
+
+INPUT_MOUSE = 0
+WM_HOOK_CALL = WM_APP + 1  # thread message asking the listener to run Win32HookHost's queued calls
+
+HOOK_DURATION_BOUNDS = geometric_bounds(5e-6, 0.3, 24)  # 5 us up to the default LowLevelHooksTimeout
 
 
 class MouseListener(Thread):
-    def __init__(self, callback: Callable, config: SmoothedScrollConfig, *args: object, **kwargs: object):
+    def __init__(
+            self,
+            callback: Callable,
+            config: SmoothedScrollConfig,
+            *args: object,
+            app_paths: Optional[AppPathCache] = None,
+            display_change_callback: Optional[Callable] = None,
+            blocklist: Optional[BlocklistWatcher] = None,
+            hook_budget: float = HOOK_BUDGET,
+            **kwargs: object
+    ):
         super().__init__(*args, **kwargs)
         self._callback = callback
         self.config = config
+        self.app_paths = app_paths or AppPathCache(Win32AppQuery())
+        self.hook_durations = Histogram(HOOK_DURATION_BOUNDS)
+        self._display_change_callback = display_change_callback
+        self.blocklist = blocklist
+        self.paused = False
+        self.hook_host = Win32HookHost(self._low_level_mouse_handler)
+        self.watchdog = HookWatchdog(self.hook_host, hook_budget, daemon=True)
 
         self._stop_event = Event()
 
     def run(self):
-        mouse_callback = LowLevelMouseProc(self._low_level_mouse_handler)
-        mouse_hook = user32.SetWindowsHookExA(
-            WH_MOUSE_LL,
-            mouse_callback,
-            c_int(0),
-            c_int(0)
-        )
+        self.hook_host.install()
+        # hidden top-level window on this thread so the message loop below also receives WM_DISPLAYCHANGE
+        notification_hwnd = _create_notification_window(self._display_change_callback) if self._display_change_callback else None
+        self.watchdog.start()
 
         msg = MSG()
         while bRet := user32.GetMessageW(msg, c_int(0), c_int(0), c_int(0)):
             if bRet == -1:
                 break
+            if msg.message == WM_HOOK_CALL:
+                self.hook_host.run_calls()
+                continue
             user32.TranslateMessage(msg)
             user32.DispatchMessageA(msg)
 
-        user32.UnhookWindowsHookEx(mouse_hook)
+        self.watchdog.stop()
+        self.hook_host.uninstall()
+        if notification_hwnd:
+            _destroy_notification_window(notification_hwnd)
+        self.app_paths.clear()
 
         self._stop_event.set()
 
     def _low_level_mouse_handler(self, n_code, w_param, l_param):
+        began = perf_counter()
+        result = self._handle_mouse_event(n_code, w_param, l_param)
+        duration = perf_counter() - began
+        self.hook_durations.record(duration)
+        self.watchdog.record(duration)
+        return result
+
+    def _handle_mouse_event(self, n_code, w_param, l_param):
         if w_param == WM_MOUSEWHEEL:
-            if not l_param.contents.reserved:
-                scroll_config = None
-                current_app_path = get_current_app_path()
-                for app_config in self.config.app_configs:
-                    if current_app_path == app_config.path or app_config.regexp.match(current_app_path):
-                        scroll_config = app_config.scroll_config
+            if not l_param.contents.reserved and not self.paused:
+                current_app_path = self.app_paths.current_app_path()
+                if self.blocklist and self.blocklist.is_blocked(current_app_path):
+                    return user32.CallNextHookEx(c_int(0), n_code, w_param, l_param)
+                scroll_config = self.config.match(current_app_path)
                 if scroll_config:
                     self._callback(
                         l_param.contents.data / (2 << 15) * (-1 if scroll_config.inverted else 1),
@@ -69,10 +120,130 @@ class MouseListener(Thread):
         super().join(timeout=timeout)
 
 
+class Win32HookHost(HookHost):
+    # owns the WH_MOUSE_LL hook; calls from other threads are queued and the listener is woken with a
+    # thread message, which its message loop answers with run_calls()
+    def __init__(self, handler: Callable):
+        self._callback = LowLevelMouseProc(handler)
+        self._hook = None
+        self._thread_id = None
+        self._calls = deque()
+
+    def install(self) -> None:
+        self._thread_id = kernel32.GetCurrentThreadId()
+        self._hook = user32.SetWindowsHookExA(WH_MOUSE_LL, self._callback, c_int(0), c_int(0))
+
+    def uninstall(self) -> None:
+        if self._hook:
+            # fails harmlessly when Windows already removed the hook
+            user32.UnhookWindowsHookEx(self._hook)
+            self._hook = None
+
+    def pointer_position(self):
+        try:
+            return GetCursorPos()
+        except Win32Error:  # no access to the input desktop, e.g. while the workstation is locked
+            return None
+
+    def call_on_listener(self, function: Callable[[], None]) -> None:
+        self._calls.append(function)
+        if self._thread_id is not None:
+            user32.PostThreadMessageW(self._thread_id, WM_HOOK_CALL, c_int(0), c_int(0))
+
+    def run_calls(self) -> None:
+        while self._calls:
+            self._calls.popleft()()
+
+
+_notification_class = None
+_display_change_callbacks = {}
+
+
+def _notification_proc(hwnd, msg, w_param, l_param):
+    if callback := _display_change_callbacks.get(hwnd):
+        callback()
+    return 0
+
+
+def _create_notification_window(on_display_change: Callable) -> int:
+    global _notification_class
+    if _notification_class is None:
+        window_class = WNDCLASS()
+        window_class.lpszClassName = 'SmoothedScrollNotifications'
+        window_class.hInstance = GetModuleHandle(None)
+        window_class.lpfnWndProc = {WM_DISPLAYCHANGE: _notification_proc}
+        _notification_class = RegisterClass(window_class)
+    hwnd = CreateWindow(_notification_class, 'SmoothedScroll', 0, 0, 0, 0, 0, 0, 0, GetModuleHandle(None), None)
+    _display_change_callbacks[hwnd] = on_display_change
+    return hwnd
+
+
+def _destroy_notification_window(hwnd: int) -> None:
+    _display_change_callbacks.pop(hwnd, None)
+    DestroyWindow(hwnd)
+
+
+class Win32DisplayQuery(DisplayQuery):
+    def current_monitor(self) -> int:
+        return int(MonitorFromPoint(GetCursorPos(), MONITOR_DEFAULTTONEAREST))
+
+    def monitor_frequency(self, monitor) -> int:
+        return EnumDisplaySettings(GetMonitorInfo(monitor)['Device'], ENUM_CURRENT_SETTINGS).DisplayFrequency
+
+    def last_vblank(self) -> Optional[float]:
+        # the compositor's last vblank in QPC ticks, which is the counter perf_counter reads on Windows
+        info = DWM_TIMING_INFO(cbSize=sizeof(DWM_TIMING_INFO))
+        if dwmapi.DwmGetCompositionTimingInfo(None, byref(info)) != 0 or not info.qpcVBlank:
+            return None
+        frequency = c_int64()
+        kernel32.QueryPerformanceFrequency(byref(frequency))
+        return info.qpcVBlank / frequency.value
+
+
+class SendInputSink(OutputSink):
+    # injects both axes of a frame with a single SendInput call, reusing one preallocated INPUT pair
+    def __init__(self):
+        self._inputs = (INPUT * 2)()
+        self._inputs[0].type = self._inputs[1].type = INPUT_MOUSE
+        self._inputs[0].mi.flags = MOUSEEVENTF_WHEEL
+        self._inputs[1].mi.flags = MOUSEEVENTF_HWHEEL
+        self._size = sizeof(INPUT)
+        self._vertical = byref(self._inputs)
+        self._horizontal = byref(self._inputs, self._size)
+
+    def emit(self, vertical: int, horizontal: int) -> None:
+        self._inputs[0].mi.data = vertical
+        self._inputs[1].mi.data = horizontal
+        if vertical and horizontal:
+            user32.SendInput(c_uint(2), self._vertical, c_int(self._size))
+        else:
+            user32.SendInput(c_uint(1), self._vertical if vertical else self._horizontal, c_int(self._size))
+
+
 def scroll(delta: int, is_horizontal: bool = False) -> None:
     mouse_event(MOUSEEVENTF_HWHEEL if is_horizontal else MOUSEEVENTF_WHEEL, 0, 0, delta, 0)
 
 
+class Win32AppQuery(AppQuery):
+    def cursor_window(self) -> int:
+        return WindowFromPoint(GetCursorPos())
+
+    def window_pid(self, hwnd: int) -> int:
+        return GetWindowThreadProcessId(hwnd)[1]
+
+    def open_process(self, pid: int):
+        return OpenProcess(MAXIMUM_ALLOWED, 0, pid)
+
+    def process_path(self, handle) -> str:
+        return GetModuleFileNameEx(handle, None)
+
+    def has_exited(self, handle) -> bool:
+        return WaitForSingleObject(handle, 0) == WAIT_OBJECT_0
+
+    def close(self, handle) -> None:
+        CloseHandle(handle)
+
+
 def get_current_app_path() -> str:
     cursor_pos = GetCursorPos()
     active_hwnd = WindowFromPoint(cursor_pos)
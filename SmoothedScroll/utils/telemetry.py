@@ -0,0 +1,102 @@
+from multiprocessing import shared_memory
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+# layout, all float64 so the writer only ever does plain memoryview stores:
+# header (capacity, samples written) followed by records of (sequence, time, vertical, horizontal, active, lateness)
+_HEADER = 2
+_FIELDS = 6
+_WRITTEN = 1
+
+
+class TelemetrySample(NamedTuple):
+    time: float
+    vertical: float
+    horizontal: float
+    active: int
+    lateness: float
+
+
+class TelemetryRing:
+    # per-frame samples from the engine process to the settings UI through one shared memory segment.
+    # The single writer never waits: it stamps a record's sequence with -1, fills it, then stamps the real
+    # sequence and bumps the written count. Readers copy a record and keep it only when its sequence read
+    # the same before and after, so a record the writer lapped mid-copy is dropped instead of torn
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool):
+        self._memory = memory
+        self._owner = owner
+        self._values = memory.buf.cast('d')
+        self.capacity = int(self._values[0])
+        self._written = int(self._values[_WRITTEN])
+
+    @classmethod
+    def create(cls, capacity: int = 1024, name: Optional[str] = None) -> 'TelemetryRing':
+        memory = shared_memory.SharedMemory(name, create=True, size=8 * (_HEADER + capacity * _FIELDS))
+        values = memory.buf.cast('d')
+        values[0] = capacity
+        values[_WRITTEN] = 0
+        values.release()
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'TelemetryRing':
+        # the engine process attaches to the segment its parent created, so on POSIX both share one resource
+        # tracker and the segment outlives this process until the creator unlinks it
+        return cls(shared_memory.SharedMemory(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    @property
+    def written(self) -> int:
+        return int(self._values[_WRITTEN])
+
+    def publish(
+            self,
+            time: float,
+            vertical: Union[int, float],
+            horizontal: Union[int, float],
+            active: int,
+            lateness: float
+    ) -> None:
+        values = self._values
+        written = self._written
+        base = _HEADER + written % self.capacity * _FIELDS
+        values[base] = -1
+        values[base + 1] = time
+        values[base + 2] = vertical
+        values[base + 3] = horizontal
+        values[base + 4] = active
+        values[base + 5] = lateness
+        values[base] = written
+        self._written = written = written + 1
+        values[_WRITTEN] = written
+
+    def read(self, since: int = 0) -> Tuple[List[TelemetrySample], int, int]:
+        # samples published after the first since, the cursor to pass next time, and how many were missed
+        # because the writer overwrote them before this reader got to them
+        values = self._values
+        written = int(values[_WRITTEN])
+        start = max(since, written - self.capacity)
+        samples = []
+        for sequence in range(start, written):
+            base = _HEADER + sequence % self.capacity * _FIELDS
+            stamp = values[base]
+            time, vertical, horizontal, active, lateness = values[base + 1:base + _FIELDS].tolist()
+            if stamp == sequence and values[base] == sequence:
+                samples.append(TelemetrySample(time, vertical, horizontal, int(active), lateness))
+        return samples, written, written - since - len(samples)
+
+    def close(self) -> None:
+        if self._values is None:
+            return
+        self._values.release()
+        self._values = None
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    def __del__(self):
+        # the mapping can't be closed while the cast view is alive, so an unclosed ring releases it first
+        if self._values is not None:
+            self._values.release()
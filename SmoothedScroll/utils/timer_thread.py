@@ -1,39 +1,156 @@
-from queue import Queue
-from threading import Thread
+import math
+from heapq import heapify, heappush, heappop
+from itertools import count
+from threading import Thread, Condition
 from time import perf_counter, sleep
 from typing import Callable, Union
 
 from ..models import TimerTask
 
+TIMER_SPIN = 0.001  # how long before a deadline the timer stops sleeping and spins, yielding the GIL as it goes
+
+
+class TimerStats:
+    def __init__(self, late_threshold: Union[int, float]):
+        self.late_threshold = late_threshold
+        self.fired = 0
+        self.cancelled = 0
+        self.late = 0
+        self.overruns = 0
+        self.max_lateness = 0
+        self._mean = 0
+        self._m2 = 0
+
+    def record(self, lateness: float) -> None:
+        self.fired += 1
+        if lateness > self.late_threshold:
+            self.late += 1
+        self.max_lateness = max(self.max_lateness, lateness)
+        # Welford's running variance, so jitter costs O(1) per frame
+        difference = lateness - self._mean
+        self._mean += difference / self.fired
+        self._m2 += difference * (lateness - self._mean)
+
+    def as_dict(self) -> dict:
+        return {
+            'fired': self.fired,
+            'cancelled': self.cancelled,
+            'late': self.late,
+            'overruns': self.overruns,
+            'mean_lateness': self._mean,
+            'max_lateness': self.max_lateness,
+            'jitter': math.sqrt(self._m2 / self.fired) if self.fired else 0,
+        }
+
 
 class Timer(Thread):
-    def __init__(self, *args: object, **kwargs: object):
+    # runs callbacks at absolute deadlines from a heap; waits by sleeping until spin seconds before
+    # the deadline and spins the rest, since OS sleeps alone are too coarse for 144-240 Hz frames
+    def __init__(
+            self,
+            *args: object,
+            clock: Callable[[], float] = perf_counter,
+            spin: Union[int, float] = TIMER_SPIN,
+            late_threshold: Union[int, float] = 0.001,
+            **kwargs: object
+    ):
         super().__init__(*args, **kwargs)
-        self._queue = Queue()
+        self._clock = clock
+        self._spin = spin
+        self._heap = []
+        self._counter = count()
+        self._condition = Condition()
+        self._running = True
+        self._busy = False
+        self.stats = TimerStats(late_threshold)
 
     def run(self):
-        while task := self._queue.get():
-            if (remained := task.start + task.timeout - perf_counter()) > 0:
-                sleep(remained)
+        while True:
+            with self._condition:
+                while self._running and not self._heap:
+                    self._condition.wait()
+                if not self._heap:
+                    return
+                remaining = self._heap[0].deadline - self._clock()
+                if remaining > self._spin:
+                    self._condition.wait(remaining - self._spin)
+                    continue
+                deadline = self._heap[0].deadline
+
+            while self._clock() < deadline:
+                sleep(0)  # hands the GIL to the hook thread, which would otherwise wait out the spin
 
+            self.run_due()
+
+    def run_due(self) -> None:
+        now = self._clock()
+        while True:
+            with self._condition:
+                if not self._heap or self._heap[0].deadline > now:
+                    self._busy = False
+                    self._condition.notify_all()
+                    return
+                task = heappop(self._heap)
+                if task.cancelled:
+                    continue
+                self._busy = True
+
+            self.stats.record(self._clock() - task.deadline)
             task.callback()
+            if self._heap and self._clock() > self._heap[0].deadline + self.stats.late_threshold:
+                self.stats.overruns += 1  # the callback ran into the next deadline
+
+    def set_deadline(self, callback: Callable, deadline: Union[int, float]) -> TimerTask:
+        return self.schedule(TimerTask(callback, 0, 0), deadline)
+
+    def schedule(self, task: TimerTask, deadline: Union[int, float]) -> TimerTask:
+        # (re)arms an existing task; it must not already be waiting in the heap
+        now = self._clock()
+        task.start = now
+        task.timeout = deadline - now
+        task.deadline = deadline
+        task.cancelled = False
+        task.sequence = next(self._counter)
+        with self._condition:
+            heappush(self._heap, task)
+            if self._heap[0] is task:
+                self._condition.notify_all()
+        return task
+
+    def reschedule(self, task: TimerTask, deadline: Union[int, float]) -> TimerTask:
+        # moves a task that may still be waiting in the heap to a new deadline
+        with self._condition:
+            if task in self._heap:
+                self._heap.remove(task)
+                heapify(self._heap)
+        return self.schedule(task, deadline)
 
-            self._queue.task_done()
+    def set_timeout(self, callback: Callable, timeout: Union[int, float]) -> TimerTask:
+        return self.set_deadline(callback, self._clock() + timeout)
 
-    def set_timeout(self, callback: Callable, timeout: Union[int, float]):
-        self._queue.put(TimerTask(callback, timeout))
+    def __call__(self, callback: Callable, timeout: Union[int, float]) -> TimerTask:
+        return self.set_timeout(callback, timeout)
 
-    def __call__(self, callback: Callable, timeout: Union[int, float]):
-        self.set_timeout(callback, timeout)
+    def cancel(self, task: TimerTask) -> None:
+        if not task.cancelled:
+            task.cancel()
+            self.stats.cancelled += 1
 
     def clear(self):
-        with self._queue.mutex:
-            self._queue.queue.clear()
+        with self._condition:
+            for task in self._heap:
+                self.cancel(task)
+            self._heap.clear()
+            self._condition.notify_all()
 
     def wait_tasks(self):
-        self._queue.join()
+        with self._condition:
+            while self._heap or self._busy:
+                self._condition.wait()
 
     def join(self, timeout=None):
         self.wait_tasks()
-        self._queue.put(None)
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
         super().join(timeout=timeout)
@@ -0,0 +1,78 @@
+import struct
+from time import perf_counter
+from typing import Callable, Iterable, List, NamedTuple, Union
+
+# file layout: header (magic, version) followed by fixed-size records of
+# (microseconds since previous record, wheel delta, flags)
+TRACE_MAGIC = b'SSTR'
+TRACE_VERSION = 1
+_HEADER = struct.Struct('<4sB')
+_RECORD = struct.Struct('<Ifb')
+_FLAG_HORIZONTAL = 1
+_MAX_GAP = 0xFFFFFFFF
+
+
+class WheelEvent(NamedTuple):
+    time: float
+    delta: float
+    is_horizontal: bool
+
+
+def _pack_record(gap: float, delta: float, is_horizontal: bool) -> bytes:
+    return _RECORD.pack(min(max(round(gap * 1e6), 0), _MAX_GAP), delta, _FLAG_HORIZONTAL if is_horizontal else 0)
+
+
+def write_trace(path: str, events: Iterable[WheelEvent]) -> None:
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(TRACE_MAGIC, TRACE_VERSION))
+        previous_time = None
+        for event in events:
+            gap = 0 if previous_time is None else event.time - previous_time
+            file.write(_pack_record(gap, event.delta, event.is_horizontal))
+            previous_time = event.time
+
+
+def read_trace(path: str) -> List[WheelEvent]:
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    magic, version = _HEADER.unpack_from(data)
+    if magic != TRACE_MAGIC or version != TRACE_VERSION:
+        raise ValueError(f'{path} is not a version {TRACE_VERSION} wheel trace')
+
+    events = []
+    time = 0
+    for gap, delta, flags in _RECORD.iter_unpack(data[_HEADER.size:]):
+        time += gap / 1e6
+        events.append(WheelEvent(time, delta, bool(flags & _FLAG_HORIZONTAL)))
+    return events
+
+
+def generate_trace(
+        count: int,
+        interval: Union[int, float],
+        delta: Union[int, float] = 120,
+        is_horizontal: bool = False,
+        start: Union[int, float] = 0
+) -> List[WheelEvent]:
+    return [WheelEvent(start + i * interval, delta, is_horizontal) for i in range(count)]
+
+
+# wraps a wheel callback, appending every event it forwards to a trace file
+class TraceRecorder:
+    def __init__(self, path: str, callback: Callable, clock: Callable[[], float] = perf_counter):
+        self._callback = callback
+        self._clock = clock
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(TRACE_MAGIC, TRACE_VERSION))
+        self._previous_time = None
+
+    def __call__(self, delta: Union[int, float], is_horizontal: bool, *args, **kwargs):
+        current_time = self._clock()
+        gap = 0 if self._previous_time is None else current_time - self._previous_time
+        self._previous_time = current_time
+        self._file.write(_pack_record(gap, delta, is_horizontal))
+        return self._callback(delta, is_horizontal, *args, **kwargs)
+
+    def close(self) -> None:
+        self._file.close()
@@ -0,0 +1,85 @@
+from heapq import heapify, heappush, heappop
+from itertools import count
+from typing import Callable, Optional, Union
+
+from ..models import TimerTask
+
+
+class VirtualClock:
+    def __init__(self, start: Union[int, float] = 0):
+        self.time = float(start)
+
+    def __call__(self) -> float:
+        return self.time
+
+    def advance(self, time: Union[int, float]) -> None:
+        if time > self.time:
+            self.time = float(time)
+
+
+# drop-in for Timer that runs tasks on a VirtualClock instead of a thread, so traces replay faster than real time
+class VirtualTimer:
+    def __init__(self, clock: VirtualClock):
+        self._clock = clock
+        self._heap = []
+        self._counter = count()
+
+    def start(self):
+        pass
+
+    def set_deadline(self, callback: Callable, deadline: Union[int, float]) -> TimerTask:
+        return self.schedule(TimerTask(callback, 0, 0), deadline)
+
+    def schedule(self, task: TimerTask, deadline: Union[int, float]) -> TimerTask:
+        now = self._clock()
+        task.start = now
+        task.timeout = deadline - now
+        task.deadline = deadline
+        task.cancelled = False
+        task.sequence = next(self._counter)
+        heappush(self._heap, task)
+        return task
+
+    def reschedule(self, task: TimerTask, deadline: Union[int, float]) -> TimerTask:
+        if task in self._heap:
+            self._heap.remove(task)
+            heapify(self._heap)
+        return self.schedule(task, deadline)
+
+    def set_timeout(self, callback: Callable, timeout: Union[int, float]) -> TimerTask:
+        return self.set_deadline(callback, self._clock() + timeout)
+
+    def __call__(self, callback: Callable, timeout: Union[int, float]) -> TimerTask:
+        return self.set_timeout(callback, timeout)
+
+    def cancel(self, task: TimerTask) -> None:
+        task.cancel()
+
+    def _drop_cancelled(self) -> None:
+        while self._heap and self._heap[0].cancelled:
+            heappop(self._heap)
+
+    def next_deadline(self) -> Optional[float]:
+        self._drop_cancelled()
+        return self._heap[0].deadline if self._heap else None
+
+    def run_next(self) -> None:
+        self._drop_cancelled()
+        task = heappop(self._heap)
+        self._clock.advance(task.deadline)
+        task.callback()
+
+    def run_until(self, time: Union[int, float]) -> None:
+        while (deadline := self.next_deadline()) is not None and deadline <= time:
+            self.run_next()
+        self._clock.advance(time)
+
+    def clear(self):
+        self._heap.clear()
+
+    def wait_tasks(self):
+        while self.next_deadline() is not None:
+            self.run_next()
+
+    def join(self, timeout=None):
+        self.wait_tasks()
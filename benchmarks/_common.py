@@ -0,0 +1,34 @@
+import os
+import sys
+import tempfile
+
+# every script imports this before the engine: the repo root goes on sys.path so SmoothedScroll and utils import
+# the way they do in the app, and APPDATA, always set on Windows, is what utils builds its paths from on import
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('APPDATA', tempfile.mkdtemp())
+
+import easing_functions
+
+from SmoothedScroll import SmoothedScrollConfig, AppConfig, ScrollConfig
+from SmoothedScroll.utils import OutputSink
+
+
+def make_config(**overrides) -> ScrollConfig:
+    # the settings window's defaults
+    options = dict(
+        distance=120, acceleration=1.0, opposite_acceleration=1.2, acceleration_delta=70, acceleration_max=14,
+        duration=500, pulse_scale=3.0, ease=easing_functions.LinearInOut, inverted=False
+    )
+    options.update(overrides)
+    return ScrollConfig(**options)
+
+
+def engine_config(scroll_config: ScrollConfig) -> SmoothedScrollConfig:
+    # one app config that matches every window, as the settings window builds it
+    return SmoothedScrollConfig(AppConfig(regexp=r'.*', scroll_config=scroll_config))
+
+
+class NullSink(OutputSink):
+    def emit(self, vertical: int, horizontal: int) -> None:
+        pass
@@ -0,0 +1,96 @@
+import gc
+import sys
+import tracemalloc
+
+from _common import make_config, engine_config, NullSink
+
+from SmoothedScroll import SmoothedScroll
+from SmoothedScroll.replay import NullSource
+from SmoothedScroll.utils import VirtualClock, VirtualTimer
+
+FREQUENCY = 144
+NOTCH_INTERVAL = 0.05  # a steady wheel spin, so the animation never ends
+WARMUP = 5
+SESSION = 60
+FRAME_BUDGET = 256  # bytes a frame may have allocated at its peak: a few float temporaries, never a whole object graph
+RETAINED_BUDGET = 0.05  # retained blocks per frame; anything above means the hot path keeps objects alive
+
+
+class FramePeaks:
+    # the tracemalloc peak of each frame above the memory traced as it started, which counts temporaries
+    # freed before the frame returns as well as what it keeps
+    def __init__(self):
+        self.frames = 0
+        self.total = 0
+        self.worst = 0
+        self.over = 0
+
+    def run(self, timer):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        timer.run_next()
+        peak = tracemalloc.get_traced_memory()[1] - before
+        self.frames += 1
+        self.total += peak
+        self.worst = max(self.worst, peak)
+        self.over += peak > FRAME_BUDGET
+
+
+def run(engine, clock, timer, config, until, peaks=None):
+    frames = 0
+    next_notch = clock()
+    while clock() < until:
+        deadline = timer.next_deadline()
+        if deadline is None or deadline > next_notch:
+            clock.advance(next_notch)
+            engine.push(120, False, config)
+            next_notch += NOTCH_INTERVAL
+        elif peaks is not None:
+            peaks.run(timer)
+        else:
+            timer.run_next()
+            frames += 1
+    return frames
+
+
+def main():
+    for merge_impulses in (False, True):
+        config = make_config(merge_impulses=merge_impulses)
+        clock = VirtualClock(start=1)
+        timer = VirtualTimer(clock)
+        engine = SmoothedScroll(
+            engine_config(config),
+            clock=clock, timer=timer, source=NullSource, sink=NullSink(), display_frequency=FREQUENCY
+        )
+
+        run(engine, clock, timer, config, clock() + WARMUP)
+        collections = []
+        gc.callbacks.append(lambda phase, info: phase == 'start' and collections.append(info['generation']))
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        frames = run(engine, clock, timer, config, clock() + SESSION)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        after = tracemalloc.take_snapshot()
+        peaks = FramePeaks()
+        run(engine, clock, timer, config, clock() + SESSION, peaks)
+        tracemalloc.stop()
+        gc.callbacks.pop()
+
+        stats = after.compare_to(before, 'filename')
+        blocks = sum(stat.count_diff for stat in stats if 'tracemalloc' not in stat.traceback[0].filename)
+        size = sum(stat.size_diff for stat in stats if 'tracemalloc' not in stat.traceback[0].filename)
+        mode = 'merged' if merge_impulses else 'stacked'
+        print(f'{mode}: {frames} frames, {blocks / frames:+.4f} blocks/frame, {size / frames:+.2f} B/frame retained, '
+              f'peak {peak} B above baseline, {len(collections)} gc runs')
+        print(f'{mode}: per-frame peak {peaks.total / peaks.frames:.1f} B mean, {peaks.worst} B worst, '
+              f'{peaks.over} of {peaks.frames} frames over {FRAME_BUDGET} B')
+        if blocks / frames > RETAINED_BUDGET:
+            sys.exit(f'{mode}: steady-state frames retain {blocks / frames:.4f} blocks each')
+        if peaks.over:
+            sys.exit(f'{mode}: {peaks.over} frames allocated more than {FRAME_BUDGET} B, up to {peaks.worst} B')
+
+
+if __name__ == '__main__':
+    main()
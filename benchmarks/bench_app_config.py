@@ -0,0 +1,47 @@
+from timeit import timeit
+
+from _common import make_config
+
+from SmoothedScroll import AppConfig, SmoothedScrollConfig
+
+NUMBER = 2_000
+PROFILES = (1, 100, 1000)
+
+
+def scan(config, path):
+    # the pre-matcher lookup from MouseListener._low_level_mouse_handler
+    scroll_config = None
+    for app_config in config.app_configs:
+        if path == app_config.path or app_config.regexp.match(path):
+            scroll_config = app_config.scroll_config
+    return scroll_config
+
+
+def profiles(count):
+    scroll_config = make_config()
+    app_configs = [AppConfig(regexp=r'.*', scroll_config=scroll_config)]
+    for i in range(1, count):
+        if i % 2:
+            app_configs.append(AppConfig(path=f'C:\\Games\\game{i}\\game{i}.exe', enabled=False))
+        else:
+            app_configs.append(AppConfig(regexp=rf'.*/tool{i}\.exe', scroll_config=scroll_config))
+    return SmoothedScrollConfig(app_configs)
+
+
+def main():
+    paths = ['C:/Windows/explorer.exe', 'C:/Games/game1/game1.exe', 'C:/Tools/tool2.exe']
+    print(f'{"profiles":>9} {"scan (us)":>10} {"cold (us)":>10} {"memo (us)":>10}')
+    for count in PROFILES:
+        config = profiles(count)
+        for path in paths:
+            assert config.match(path) is scan(config, path), path
+
+        scan_time = timeit(lambda: [scan(config, path) for path in paths], number=NUMBER)
+        cold_time = timeit(lambda: [config.matcher._memo.clear() or config.match(path) for path in paths], number=NUMBER)
+        memo_time = timeit(lambda: [config.match(path) for path in paths], number=NUMBER)
+        per_lookup = 1e6 / NUMBER / len(paths)
+        print(f'{count:>9} {scan_time * per_lookup:>10.2f} {cold_time * per_lookup:>10.2f} {memo_time * per_lookup:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+from timeit import Timer as TimeIt
+
+import _common  # puts the repo root on sys.path and sets APPDATA
+
+from SmoothedScroll.utils import AppQuery, AppPathCache, VirtualClock
+
+OPEN_COST = 30e-6  # rough cost of OpenProcess plus GetModuleFileNameEx on Windows
+
+
+class TableAppQuery(AppQuery):
+    # windows and exes from dicts, processes never exit; the behaviour is covered by tests/test_app_path_cache.py
+    def __init__(self, windows, exes):
+        self.windows = windows
+        self.exes = exes
+
+    def window_pid(self, hwnd):
+        return self.windows[hwnd]
+
+    def open_process(self, pid):
+        return pid
+
+    def process_path(self, handle):
+        return self.exes[handle]
+
+    def has_exited(self, handle):
+        return False
+
+    def close(self, handle):
+        pass
+
+
+def main():
+    # the wheel over a handful of windows of a few apps, the common case
+    exes = {pid: f'C:\\Apps\\app{pid}.exe' for pid in range(1, 6)}
+    windows = {hwnd: pid for pid in exes for hwnd in range(pid * 100, pid * 100 + 4)}
+    hwnds = sorted(windows)
+    cache = AppPathCache(TableAppQuery(windows, exes), clock=VirtualClock())
+    lookups = 10_000
+    for i in range(lookups):
+        cache.app_path(hwnds[i * 7 % len(hwnds)])
+    hit_rate = cache.hits / lookups
+    per_lookup = min(TimeIt(lambda: cache.app_path(hwnds[3])).repeat(5, 100_000)) / 100_000
+    print(f'hit rate over {len(hwnds)} windows of 5 apps: {hit_rate:.2%}, misses: {cache.misses}')
+    print(f'cached lookup: {per_lookup * 1e6:.3f} us (an uncached one costs ~{OPEN_COST * 1e6:.0f} us in syscalls)')
+
+    # many windows of one process: every new window is a hit that also evicts the oldest window
+    windows = {hwnd: 1 for hwnd in range(100_000)}
+    cache = AppPathCache(TableAppQuery(windows, {1: 'C:/Apps/browser.exe'}), clock=VirtualClock())
+    cache.app_path(0)
+    hwnds = iter(range(1, 100_000))
+    per_new_window = min(TimeIt(lambda: cache.app_path(next(hwnds))).repeat(3, 20_000)) / 20_000
+    print(f'new window of a cached process: {per_new_window * 1e6:.3f} us, {cache.stats()}')
+
+
+if __name__ == '__main__':
+    main()
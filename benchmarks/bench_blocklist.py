@@ -0,0 +1,39 @@
+import json
+import os
+import sys
+import tempfile
+from timeit import timeit
+
+import _common  # puts the repo root on sys.path and sets APPDATA
+
+from SmoothedScroll.utils import BlocklistWatcher
+
+NUMBER = 200_000
+SIZES = (10, 1_000, 100_000)
+FLATNESS = 2.0  # the largest list may cost at most this many times the smallest
+
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), 'blocklist.json')
+    hit = 'C:/Games/Game5/Game5.exe'
+    miss = 'C:/Windows/explorer.exe'
+
+    costs = []
+    print(f'{"entries":>8} {"hit (ns)":>9} {"miss (ns)":>10}')
+    for size in SIZES:
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump([f'game{i}.exe' for i in range(size)], file)
+        blocklist = BlocklistWatcher(path)
+        assert blocklist.is_blocked(hit) and not blocklist.is_blocked(miss)
+
+        hit_time = timeit(lambda: blocklist.is_blocked(hit), number=NUMBER) / NUMBER * 1e9
+        miss_time = timeit(lambda: blocklist.is_blocked(miss), number=NUMBER) / NUMBER * 1e9
+        costs.append(max(hit_time, miss_time))
+        print(f'{size:>8} {hit_time:>9.1f} {miss_time:>10.1f}')
+
+    if costs[-1] > costs[0] * FLATNESS:
+        sys.exit(f'lookup cost grew {costs[-1] / costs[0]:.1f}x with the blocklist size')
+
+
+if __name__ == '__main__':
+    main()
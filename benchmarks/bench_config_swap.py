@@ -0,0 +1,58 @@
+import multiprocessing
+from time import perf_counter
+
+from _common import make_config, engine_config
+
+from SmoothedScroll import SmoothedScroll
+from SmoothedScroll.replay import NullSource
+
+ROUNDS = 10
+
+
+def swap_config(duration):
+    return engine_config(make_config(duration=duration))
+
+
+def engine_task(config, control):
+    # a headless engine: the same control path as engine.smoothed_scroll_task without the win32 hook
+    SmoothedScroll(config, source=NullSource, sink=lambda delta, is_horizontal: None,
+                   display_frequency=144, control=control).start(is_block=True)
+
+
+def spawn(context, config):
+    connection, engine_connection = context.Pipe()
+    process = context.Process(target=engine_task, args=(config, engine_connection), daemon=True)
+    process.start()
+    assert connection.recv()[0] == 'ready'
+    return process, connection
+
+
+def main():
+    context = multiprocessing.get_context('spawn')  # what Windows uses
+
+    process, connection = spawn(context, swap_config(500))
+    swaps = []
+    for i in range(ROUNDS):
+        began = perf_counter()
+        connection.send(('config', swap_config(400 + i), True))
+        assert connection.recv() == ('done', 'config')
+        swaps.append(perf_counter() - began)
+    connection.send(('stop', None, False))
+    process.join()
+
+    restarts = []
+    process, connection = spawn(context, swap_config(500))
+    for i in range(ROUNDS):
+        began = perf_counter()
+        process.terminate()
+        process.join(timeout=5)
+        process, connection = spawn(context, swap_config(400 + i))
+        restarts.append(perf_counter() - began)
+    process.terminate()
+
+    print(f'hot swap: median {sorted(swaps)[ROUNDS // 2] * 1e3:8.2f} ms')
+    print(f'restart:  median {sorted(restarts)[ROUNDS // 2] * 1e3:8.2f} ms (engine imports only, no GUI modules)')
+
+
+if __name__ == '__main__':
+    main()
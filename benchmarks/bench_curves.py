@@ -0,0 +1,44 @@
+from timeit import timeit
+
+from _common import make_config
+
+from SmoothedScroll.utils import CurveCache, pulse
+
+NUMBER = 100_000
+
+
+def exact_at(config, progress):
+    return config.ease(end=120)(pulse(progress, config.pulse_scale))
+
+
+def main():
+    config = make_config()
+    elapsed = config.duration * 0.37
+
+    # the pre-table path: an easing object per notch and two exp() calls per frame
+    def exact_frame():
+        return config.ease(end=120)(pulse(elapsed / config.duration, config.pulse_scale))
+
+    curves = CurveCache()
+    table = curves.get(config)
+
+    def table_frame():
+        return table(elapsed) * 120
+
+    def cached_notch():
+        return curves.get(config)
+
+    results = {
+        'exact frame': timeit(exact_frame, number=NUMBER),
+        'table frame': timeit(table_frame, number=NUMBER),
+        'cache lookup per notch': timeit(cached_notch, number=NUMBER),
+    }
+    for name, total in results.items():
+        print(f'{name:>24}: {total / NUMBER * 1e9:8.1f} ns')
+    print(f'{"speedup":>24}: {results["exact frame"] / results["table frame"]:8.2f}x')
+    error = max(abs(table(config.duration * i / 10000) * 120 - exact_at(config, i / 10000)) for i in range(10001))
+    print(f'{"max abs error (px)":>24}: {error:.2e}')
+
+
+if __name__ == '__main__':
+    main()
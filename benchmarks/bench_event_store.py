@@ -0,0 +1,82 @@
+from time import perf_counter
+
+from _common import make_config
+
+from SmoothedScroll.models import ScrollEventQueue
+from SmoothedScroll.utils import CurveCache
+
+BATCH = 2_000  # event evaluations per timed batch
+ROUNDS = 200  # batches per variant, interleaved; the best one is reported since this host's noise only adds
+CONCURRENCY = (1, 3, 10, 50, 200)
+
+
+class LegacyScrollEvent:
+    # the per-impulse record of the frame loop before ScrollEventQueue, kept here as the baseline
+    __slots__ = ('is_horizontal', 'delta', 'curve', 'config', 'previous_delta', 'start')
+
+    def __init__(self, delta, is_horizontal, config, curve, start):
+        self.is_horizontal = is_horizontal
+        self.delta = delta
+        self.curve = curve
+        self.config = config
+        self.previous_delta = .0
+        self.start = start
+
+
+def list_frame(queue, current_time):
+    # the old frame: copy the list, walk the records, list.remove finished ones
+    delta_x, delta_y = 0, 0
+    for scroll_event in queue[:]:
+        elapsed = current_time - scroll_event.start
+        finished = elapsed >= scroll_event.config.duration
+        delta = scroll_event.curve(elapsed) * scroll_event.delta - scroll_event.previous_delta
+        if scroll_event.is_horizontal:
+            delta_y += delta
+        else:
+            delta_x += delta
+        scroll_event.previous_delta += delta
+        if finished:
+            queue.remove(scroll_event)
+    return delta_x, delta_y
+
+
+def best_of(variants, frames, make_state):
+    # microseconds per frame for each variant; a fresh state per frame when frames consume their events
+    best = dict.fromkeys(variants, float('inf'))
+    for _ in range(ROUNDS):
+        for name, (frame, fresh) in variants.items():
+            states = [make_state(name) for _ in range(frames)] if fresh else [make_state(name)] * frames
+            began = perf_counter()
+            for state in states:
+                frame(state)
+            best[name] = min(best[name], (perf_counter() - began) / frames * 1e6)
+    return best
+
+
+def main():
+    config = make_config()
+    curve = CurveCache().get(config)
+
+    for finishing in (False, True):
+        # steady: every animation is mid-flight; finishing: half of them end on the measured frame
+        print(f'\n{"events":>8} {"list (us)":>12} {"queue (us)":>12}   {"finishing" if finishing else "steady"}')
+        for count in CONCURRENCY:
+            starts = [0 if finishing and i % 2 else 0.4 for i in range(count)]
+
+            def make_state(name):
+                if name == 'list':
+                    return [LegacyScrollEvent(120, i % 3 == 0, config, curve, start) for i, start in enumerate(starts)]
+                queue = ScrollEventQueue()
+                for i, start in enumerate(starts):
+                    queue.append(120, i % 3 == 0, config.duration, start, curve)
+                return queue
+
+            best = best_of({
+                'list': (lambda queue: list_frame(queue, 0.6), finishing),
+                'queue': (lambda queue: queue.advance(0.6), finishing),
+            }, max(BATCH // count, 10), make_state)
+            print(f'{count:>8} {best["list"]:>12.3f} {best["queue"]:>12.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+import os
+import sys
+from time import perf_counter
+
+import _common  # puts the repo root on sys.path and sets APPDATA
+
+os.makedirs(os.path.join(os.environ['APPDATA'], 'SmoothedScroll'), exist_ok=True)
+
+from utils.find_games import GameWatcher, is_steam
+
+PROCESSES = (1_000, 5_000, 20_000)
+PASSES = 10
+
+
+class FakeProcessTable:
+    def __init__(self, count, unreadable=0):
+        self.processes = {pid: (f'proc{pid}.exe', f'C:/Windows/proc{pid}.exe', 0) for pid in range(2, count)}
+        # services and elevated processes: listed, but info() is refused like psutil's AccessDenied
+        self.unreadable = set(range(count, count + unreadable))
+        self.processes[1] = ('steam.exe', 'C:/Steam/steam.exe', 0)
+        self.next_pid = count + unreadable
+        self.info_calls = 0
+
+    def spawn(self, name, ppid):
+        self.processes[self.next_pid] = (name, f'C:/Games/{name}', ppid)
+        self.next_pid += 1
+
+    def pids(self):
+        return list(self.processes) + list(self.unreadable)
+
+    def info(self, pid):
+        self.info_calls += 1
+        return self.processes.get(pid)
+
+
+def full_sweep(table):
+    # the pre-watcher pass: look at every process, then walk every Steam process's children
+    games = set()
+    children = {}
+    for pid in table.pids():
+        info = table.info(pid)
+        children.setdefault(info[2], []).append(pid)
+    for pid in table.pids():
+        name, exe, _ = table.info(pid)
+        if is_steam(name) and exe:
+            stack = list(children.get(pid, ()))
+            while stack:
+                child = stack.pop()
+                child_name, child_exe, _ = table.info(child)
+                if child_exe and 'steamwebhelper' not in child_name.lower():
+                    games.add(os.path.basename(child_exe))
+                stack.extend(children.get(child, ()))
+    return games
+
+
+def measure(table, scan):
+    table.info_calls = 0
+    began = perf_counter()
+    for i in range(PASSES):
+        table.spawn(f'game{i}.exe', 1)
+        scan()
+    return (perf_counter() - began) / PASSES * 1e3, table.info_calls / PASSES
+
+
+def main():
+    print(f'{"processes":>10} {"sweep ms":>9} {"sweep queries":>14} {"watch ms":>9} {"watch queries":>14}')
+    for count in PROCESSES:
+        table = FakeProcessTable(count)
+        sweep_time, sweep_queries = measure(table, lambda: full_sweep(table))
+
+        table = FakeProcessTable(count)
+        watcher = GameWatcher(process_table=table)
+        watcher.scan()  # the first pass sees everything; later passes only see what's new
+        watch_time, watch_queries = measure(table, watcher.scan)
+        print(f'{count:>10} {sweep_time:>9.2f} {sweep_queries:>14.0f} {watch_time:>9.2f} {watch_queries:>14.0f}')
+
+    # processes that can't be read are asked about once, not on every pass
+    table = FakeProcessTable(1_000, unreadable=100)
+    watcher = GameWatcher(process_table=table)
+    watcher.scan()
+    table.info_calls = 0
+    for _ in range(5):
+        watcher.scan()
+    print(f'5 idle passes with 100 unreadable processes: {table.info_calls} queries')
+    if table.info_calls:
+        sys.exit(f'{table.info_calls} queries for processes that were already seen')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+import math
+import random
+from time import perf_counter, sleep
+
+from _common import make_config, engine_config, NullSink
+
+from SmoothedScroll import SmoothedScroll
+from SmoothedScroll.replay import NullSource, Replay, percentile
+from SmoothedScroll.utils import StaticRefreshRate, Timer, WheelEvent
+
+FREQUENCY = 144
+VBLANK = 0.0031  # phase of the fake display's vblanks
+NOTCHES = 300
+SESSIONS = 6  # latencies are pooled over this many seeded sessions
+HOPS = 100
+
+
+class FakeDisplay(StaticRefreshRate):
+    def last_vblank(self):
+        return VBLANK
+
+
+def wheel_session(seed):
+    # the gaps are jittered: real notches have no fixed phase to the frame grid, and exact multiples would hand
+    # whichever mode happens to line up with them a latency it wouldn't see in use
+    rng = random.Random(seed)
+    time = 0
+    events = []
+    for _ in range(NOTCHES):
+        time += rng.choice((0.013, 0.047, 0.2, 0.9)) * rng.uniform(0.8, 1.25)
+        events.append(WheelEvent(time, 120, False))
+    return events
+
+
+def starts_animation(events, duration):
+    # whether each notch arrives with nothing animating, the case the immediate first frame is for
+    previous = -math.inf
+    for event in events:
+        yield event.time - previous > duration
+        previous = event.time
+
+
+def phase_error(calls):
+    interval = 1 / FREQUENCY
+    return max(abs((time - VBLANK + interval / 2) % interval - interval / 2) for time, _, _ in calls)
+
+
+def replayed(immediate):
+    # pooled latencies of every notch and of the notches that start an animation, the engine's own
+    # first_emit_latency histogram of the first session, and the worst distance of an output from a vblank
+    latencies, idle, phase, histogram = [], [], 0, None
+    for seed in range(SESSIONS):
+        config = make_config()
+        replay = Replay(config, FREQUENCY, refresh_rate=FakeDisplay(FREQUENCY), metrics=True,
+                        immediate_first_frame=immediate)
+        events = wheel_session(seed)
+        report = replay.run(events)
+        latencies += report.latencies
+        idle += (latency for latency, start in zip(report.latencies, starts_animation(events, config.duration))
+                 if start)
+        phase = max(phase, phase_error(replay.sink.calls))
+        histogram = histogram or replay.engine.get_stats()['engine']['first_emit_latency']
+    return latencies, idle, histogram, phase
+
+
+def hop_latency(immediate):
+    # push to the start of the first frame on a real Timer thread; the animations are kept short
+    config = make_config(duration=20)
+    timer = Timer(daemon=True)
+    engine = SmoothedScroll(
+        engine_config(config),
+        timer=timer, source=NullSource, sink=NullSink(), display_frequency=FREQUENCY,
+        immediate_first_frame=immediate
+    )
+    first_frames = []
+
+    def frame(run=engine._frame):
+        if len(first_frames) < len(pushes):
+            first_frames.append(perf_counter())
+        run()
+
+    engine._frame = engine._frame_task.callback = frame
+    pushes = []
+    timer.start()
+    for _ in range(HOPS):
+        pushes.append(perf_counter())
+        engine.push(120, False, config)
+        while engine._pending or len(first_frames) < len(pushes):
+            sleep(0.001)
+    timer.join()
+    return [(frame_time - push) * 1e6 for push, frame_time in zip(pushes, first_frames)]
+
+
+def main():
+    # whether immediate mode stays on the grid and beats the timer path is checked in tests/test_first_frame.py
+    print(f'fake clock, {SESSIONS} x {NOTCHES} notches at {FREQUENCY} Hz, vblank phase {VBLANK * 1e3} ms, '
+          f'input to first output')
+    print(f'{"mode":>10} {"p50 ms":>7} {"p99 ms":>7} {"idle p50":>9} {"idle p99":>9} {"hist p50":>9} {"hist p99":>9} '
+          f'{"phase err ms":>13}')
+    for immediate in (False, True):
+        latencies, idle, histogram, phase = replayed(immediate)
+        print(f'{"immediate" if immediate else "timer":>10} {percentile(latencies, 50) * 1e3:7.2f} '
+              f'{percentile(latencies, 99) * 1e3:7.2f} {percentile(idle, 50) * 1e3:9.2f} '
+              f'{percentile(idle, 99) * 1e3:9.2f} {histogram["p50"] * 1e3:9.2f} '
+              f'{histogram["p99"] * 1e3:9.2f} {phase * 1e3:13.4f}')
+
+    print(f'\nreal Timer, push to first frame over {HOPS} animations')
+    print(f'{"mode":>10} {"p50 us":>8} {"p99 us":>8}')
+    for immediate in (False, True):
+        hops = hop_latency(immediate)
+        print(f'{"immediate" if immediate else "timer":>10} {percentile(hops, 50):8.1f} {percentile(hops, 99):8.1f}')
+
+
+if __name__ == '__main__':
+    main()
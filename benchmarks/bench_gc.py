@@ -0,0 +1,48 @@
+import sys
+
+from _common import make_config
+
+from SmoothedScroll.replay import Replay
+from SmoothedScroll.utils import RecordingSink, generate_trace
+
+FREQUENCY = 144
+BURSTS = 20
+CYCLES_PER_EMIT = 50  # reference cycles left behind per injection, standing in for allocations elsewhere
+
+
+class GarbageSink(RecordingSink):
+    def emit(self, vertical: int, horizontal: int) -> None:
+        super().emit(vertical, horizontal)
+        for _ in range(CYCLES_PER_EMIT):
+            cycle = []
+            cycle.append(cycle)
+
+
+def bursts():
+    # flicks of 8 notches, each one long enough to finish before the next starts
+    events = []
+    for burst in range(BURSTS):
+        events.extend(generate_trace(8, 0.03, start=burst * 1.5))
+    return events
+
+
+def main():
+    config = make_config()
+    print(f'{"mode":>9} {"collections":>12} {"in animation":>13} {"max in animation ms":>20} {"deferred":>9}')
+    overlapping = {}
+    for defer_gc in (False, True):
+        replay = Replay(config, FREQUENCY, metrics=True, defer_gc=defer_gc)
+        replay.sink = replay.engine._sink = GarbageSink(replay.clock)
+        replay.run(bursts())
+        stats = replay.engine.get_stats()['gc']
+        overlapping[defer_gc] = stats['animation_pauses']['count']
+        print(f'{"deferred" if defer_gc else "default":>9} {stats["pauses"]["count"]:>12} '
+              f'{stats["animation_pauses"]["count"]:>13} {stats["animation_pauses"]["max"] * 1e3:>20.3f} '
+              f'{stats["deferred"]:>9}')
+
+    if overlapping[True]:
+        sys.exit(f'{overlapping[True]} collections ran inside an animation with defer_gc')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,18 @@
+from timeit import Timer as TimeIt
+
+import _common  # puts the repo root on sys.path and sets APPDATA
+
+from SmoothedScroll.utils import HookHost, HookWatchdog
+
+def main():
+    # record() runs at the end of every hook callback and never touches the host; reinstalling is covered by
+    # tests/test_hook_watchdog.py
+    watchdog = HookWatchdog(HookHost())
+    record = min(TimeIt(lambda: watchdog.record(1e-4)).repeat(5, 200_000)) / 200_000
+    print(f'record: {record * 1e9:6.1f} ns per hook callback')
+    over_budget = min(TimeIt(lambda: watchdog.record(watchdog.budget * 2)).repeat(5, 200_000)) / 200_000
+    print(f'record: {over_budget * 1e9:6.1f} ns per over-budget callback')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import sys
+from bisect import bisect_right
+from itertools import accumulate
+
+from _common import make_config
+
+from SmoothedScroll.replay import Replay
+from SmoothedScroll.utils import generate_trace
+
+TRACES = {
+    'single notch': generate_trace(1, 0),
+    'slow (150 ms)': generate_trace(10, 0.15),
+    'fast (30 ms)': generate_trace(30, 0.03),
+    'storm (10 ms)': generate_trace(100, 0.01),
+    'free-spin (3 ms)': generate_trace(600, 0.003),
+}
+TOLERANCE = 0.03  # merged output may trail or lead the stacked one by this share of the trace's total distance
+
+
+def run(trace, merge_impulses):
+    session = Replay(make_config(merge_impulses=merge_impulses), 144)
+    report = session.run(trace)
+    times = [time for time, _, _ in session.sink.calls]
+    positions = list(accumulate(delta for _, delta, _ in session.sink.calls))
+    return report, times, positions
+
+
+def position_at(times, positions, time):
+    index = bisect_right(times, time)
+    return positions[index - 1] if index else 0
+
+
+def main():
+    failures = []
+    print(f'{"trace":>18} {"mode":>7} {"frames":>7} {"frame us":>9} {"peak us":>8} {"total":>8} {"max dev":>8}')
+    for name, trace in TRACES.items():
+        multi, multi_times, multi_positions = run(trace, False)
+        merged, merged_times, merged_positions = run(trace, True)
+        deviation = max(
+            abs(position_at(multi_times, multi_positions, time) - position_at(merged_times, merged_positions, time))
+            for time in multi_times + merged_times
+        )
+        for mode, report, positions, dev in (
+                ('multi', multi, multi_positions, 0),
+                ('merged', merged, merged_positions, deviation)
+        ):
+            summary = report.summary()
+            print(
+                f'{name:>18} {mode:>7} {summary["frames"]:>7} {summary["frame_time_us"]["mean"]:>9.1f} '
+                f'{summary["frame_time_us"]["max"]:>8.1f} {positions[-1]:>8} {dev:>8}'
+            )
+        total = multi_positions[-1]
+        if abs(merged_positions[-1] - total) > 1 or deviation > TOLERANCE * abs(total):
+            failures.append(f'{name}: merged ends at {merged_positions[-1]} of {total}, '
+                            f'up to {deviation} px ({deviation / abs(total):.1%}) apart on the way')
+
+    if failures:
+        sys.exit('\n'.join(failures))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+from time import perf_counter
+
+from _common import make_config
+
+from SmoothedScroll.replay import Replay
+from SmoothedScroll.utils import generate_trace
+
+ROUNDS = 20
+
+
+def main():
+    config = make_config()
+    trace = generate_trace(50, 0.02) + generate_trace(20, 0.1, start=2)
+
+    results = {}
+    for enabled in (False, True, False, True):  # interleaved so warm-up doesn't favour either side
+        best = float('inf')
+        for _ in range(ROUNDS):
+            session = Replay(config, 144, metrics=enabled)
+            began = perf_counter()
+            report = session.run(trace)
+            best = min(best, (perf_counter() - began) / len(report.frame_times))
+        results[enabled] = min(results.get(enabled, float('inf')), best)
+
+    print(f'metrics off: {results[False] * 1e6:7.2f} us per frame')
+    print(f'metrics on:  {results[True] * 1e6:7.2f} us per frame ({results[True] / results[False] - 1:+.1%})')
+
+
+if __name__ == '__main__':
+    main()
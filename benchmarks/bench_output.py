@@ -0,0 +1,26 @@
+from _common import make_config
+
+from SmoothedScroll.replay import Replay
+from SmoothedScroll.utils import generate_trace
+
+TRACES = {
+    'vertical notch': generate_trace(1, 0),
+    'vertical burst': generate_trace(20, 0.03),
+    'diagonal burst': sorted(
+        generate_trace(20, 0.03) + generate_trace(20, 0.03, is_horizontal=True, start=0.015),
+        key=lambda event: event.time
+    ),
+}
+
+
+def main():
+    config = make_config()
+    print(f'{"trace":>16} {"frames":>7} {"per-axis calls":>15} {"batched calls":>14}')
+    for name, trace in TRACES.items():
+        report = Replay(config, 144).run(trace)
+        # before batching every non-zero axis delta was its own mouse_event call
+        print(f'{name:>16} {len(report.frame_times):>7} {report.outputs:>15} {report.injections:>14}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+from time import perf_counter
+
+import _common  # puts the repo root on sys.path and sets APPDATA
+
+from utils.process_index import ProcessNameIndex, WindowTable
+
+WINDOWS = (50, 200, 1_000)
+PASSES = 100
+NAME_COST = 50e-6  # rough cost of psutil.Process(pid).name() on Windows
+
+
+class FakeWindowTable(WindowTable):
+    def __init__(self, count):
+        self.pids = set(range(1, count + 1))
+        self.next_pid = count + 1
+        self.name_calls = 0
+
+    def churn(self):
+        # one window closes and another opens between two menu openings
+        self.pids.discard(min(self.pids))
+        self.pids.add(self.next_pid)
+        self.next_pid += 1
+
+    def window_pids(self):
+        return self.pids
+
+    def process_name(self, pid):
+        self.name_calls += 1
+        began = perf_counter()
+        while perf_counter() - began < NAME_COST:
+            pass
+        return f'app{pid % 40}.exe'
+
+
+def rebuild(table):
+    # the pre-index menu build: one name query per visible window every time
+    return sorted({table.process_name(pid) for pid in table.window_pids()} - {None})
+
+
+def measure(table, build):
+    table.name_calls = 0
+    began = perf_counter()
+    for _ in range(PASSES):
+        table.churn()
+        build()
+    return (perf_counter() - began) / PASSES * 1e3, table.name_calls / PASSES
+
+
+def main():
+    print(f'{"windows":>8} {"rebuild ms":>11} {"queries":>8} {"index ms":>9} {"queries":>8}')
+    for count in WINDOWS:
+        table = FakeWindowTable(count)
+        rebuild_time, rebuild_queries = measure(table, lambda: rebuild(table))
+
+        table = FakeWindowTable(count)
+        index = ProcessNameIndex(table)
+        index.refresh()
+        index_time, index_queries = measure(table, index.refresh)
+        assert index.names() == rebuild(table)
+        print(f'{count:>8} {rebuild_time:>11.2f} {rebuild_queries:>8.0f} {index_time:>9.3f} {index_queries:>8.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+from _common import make_config
+
+from SmoothedScroll.replay import Replay
+from SmoothedScroll.utils import generate_trace
+
+FREQUENCY = 144
+ROUNDS = 3
+
+
+def session(config):
+    # a CPU-bound stand-in for the engine's threads: a long replay on the virtual clock
+    began = perf_counter()
+    Replay(config, FREQUENCY).run(generate_trace(400, 0.05))
+    return perf_counter() - began
+
+
+def main():
+    config = make_config()
+    path = os.path.join(tempfile.mkdtemp(), 'engine-profile.collapsed')
+    session(config)
+
+    baseline = min(session(config) for _ in range(ROUNDS))
+    profiled = []
+    for _ in range(ROUNDS):
+        engine = Replay(config, FREQUENCY).engine
+        sampler = engine.profile(path, duration=60)
+        profiled.append(session(config))
+        engine.profile(path)  # a second request ends the capture early
+        sampler.join()
+    profiled = min(profiled)
+
+    with open(path, encoding='utf-8') as file:
+        lines = file.read().splitlines()
+    print(f'without sampler: {baseline * 1e3:8.1f} ms')
+    print(f'with sampler:    {profiled * 1e3:8.1f} ms ({(profiled / baseline - 1) * 100:+.1f}%)')
+    print(f'samples: {sampler.samples}, distinct stacks: {len(lines)}, dropped: {sampler.dropped}')
+    hottest = max(lines, key=lambda line: int(line.rsplit(' ', 1)[1]))
+    print(f'hottest stack: {hottest[-160:]}')
+    if not any('_frame' in line for line in lines):
+        sys.exit('the capture never saw an animation frame')
+
+
+if __name__ == '__main__':
+    main()
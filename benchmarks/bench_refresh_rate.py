@@ -0,0 +1,28 @@
+from timeit import Timer as TimeIt
+
+import _common  # puts the repo root on sys.path and sets APPDATA
+
+from SmoothedScroll.utils import DisplayQuery, CachedRefreshRate
+
+class TwoMonitors(DisplayQuery):
+    # the cursor alternates between two monitors; caching and pacing are covered by tests/test_refresh_rate.py
+    def __init__(self):
+        self.current = 0
+
+    def current_monitor(self):
+        self.current ^= 1
+        return self.current
+
+    def monitor_frequency(self, monitor):
+        return 144 if monitor else 240
+
+
+def main():
+    # frequency() runs as every animation starts, on the hook's path to the first frame
+    provider = CachedRefreshRate(TwoMonitors())
+    per_call = min(TimeIt(provider.frequency).repeat(5, 200_000)) / 200_000
+    print(f'cached frequency(): {per_call * 1e9:6.1f} ns per animation start')
+
+
+if __name__ == '__main__':
+    main()
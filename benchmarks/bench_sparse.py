@@ -0,0 +1,67 @@
+from time import process_time, sleep
+
+import easing_functions
+
+from _common import make_config, engine_config, NullSink
+
+from SmoothedScroll import SmoothedScroll
+from SmoothedScroll.replay import NullSource, Replay
+from SmoothedScroll.utils import Timer, generate_trace
+
+FREQUENCY = 144
+ANIMATIONS = 5
+
+
+def replayed(config, trace, sparse_frames):
+    replay = Replay(config, FREQUENCY, sparse_frames=sparse_frames)
+    summary = replay.run(trace).summary()
+    return summary['frames'], summary['error']['final']
+
+
+def real_time(config, sparse_frames):
+    # single notches on a real Timer thread: CPU time includes the spin-wait before every wake-up
+    timer = Timer(daemon=True)
+    engine = SmoothedScroll(
+        engine_config(config),
+        timer=timer, source=NullSource, sink=NullSink(), display_frequency=FREQUENCY, sparse_frames=sparse_frames
+    )
+    timer.start()
+    began = process_time()
+    for _ in range(ANIMATIONS):
+        engine.push(120, False, config)
+        sleep(0.01)
+        while engine._pending:
+            sleep(0.01)
+        sleep(config.duration * 0.2)
+    cpu = process_time() - began
+    timer.join()
+    return timer.stats.fired / ANIMATIONS, cpu / ANIMATIONS * 1e3
+
+
+def main():
+    traces = {
+        'single notch': generate_trace(1, 1),
+        'flick (8 notches, 30 ms)': generate_trace(8, 0.03),
+        'slow reading (10 notches, 700 ms)': generate_trace(10, 0.7),
+    }
+    print(f'{"ease":>14} {"trace":>34} {"dense frames":>13} {"sparse frames":>14} {"dense error":>12} '
+          f'{"sparse error":>13}')
+    for ease in (easing_functions.LinearInOut, easing_functions.QuadEaseOut, easing_functions.CubicEaseInOut):
+        config = make_config(ease=ease)
+        for name, trace in traces.items():
+            dense_frames, dense_error = replayed(config, trace, False)
+            sparse_frames, sparse_error = replayed(config, trace, True)
+            print(f'{ease.__name__:>14} {name:>34} {dense_frames:>13} {sparse_frames:>14} {dense_error:>12.2f} '
+                  f'{sparse_error:>13.2f}')
+
+    print(f'\nreal Timer, {FREQUENCY} Hz, per single-notch animation')
+    print(f'{"ease":>14} {"mode":>7} {"wake-ups":>9} {"cpu ms":>8}')
+    for ease in (easing_functions.LinearInOut, easing_functions.CubicEaseInOut):
+        config = make_config(ease=ease)
+        for sparse_frames in (False, True):
+            wakeups, cpu = real_time(config, sparse_frames)
+            print(f'{ease.__name__:>14} {"sparse" if sparse_frames else "dense":>7} {wakeups:>9.0f} {cpu:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
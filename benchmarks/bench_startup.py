@@ -0,0 +1,74 @@
+import subprocess
+import sys
+
+from _common import ROOT
+
+IMPORT_BUDGET_MS = 150
+GUI_MODULES = ('gui', 'tkinter', 'sv_ttk', 'PIL', 'pystray', 'psutil', 'webbrowser')
+
+# prints the child's resident set after the imports, then exits
+RSS_PROBE = 'import os, psutil; print(psutil.Process(os.getpid()).memory_info().rss)'
+
+
+def run(code, *flags):
+    return subprocess.run(
+        [sys.executable, *flags, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+
+def importable(module):
+    # find_spec alone would also list gui, which fails to import wherever one of its dependencies is missing
+    try:
+        run(f'import {module}')
+    except subprocess.CalledProcessError:
+        return False
+    return True
+
+
+def import_time_ms(module):
+    # cumulative microseconds of the module's own line in -X importtime output
+    stderr = run(f'import {module}', '-X', 'importtime').stderr
+    for line in stderr.splitlines():
+        _, _, cumulative, name = (part.strip() for part in line.replace('import time:', '|').split('|'))
+        if name == module:
+            return int(cumulative) / 1000
+    raise RuntimeError(f'{module} missing from -X importtime output')
+
+
+def main():
+    failures = []
+
+    engine_ms = min(import_time_ms('engine') for _ in range(5))
+    print(f'import engine: {engine_ms:.1f} ms (budget {IMPORT_BUDGET_MS} ms)')
+    if engine_ms > IMPORT_BUDGET_MS:
+        failures.append(f'engine import took {engine_ms:.1f} ms')
+
+    leaked = run(f'import sys, engine; print(*(m for m in {GUI_MODULES!r} if m in sys.modules))').stdout.split()
+    if leaked:
+        failures.append(f'engine imports GUI modules: {", ".join(leaked)}')
+
+    # what a spawned engine child really does first: re-import the parent's main.py as __mp_main__
+    try:
+        leaked = run(
+            "import runpy, sys; runpy.run_path('main.py', run_name='__mp_main__'); import engine; "
+            f"print(*(m for m in {GUI_MODULES!r} if m in sys.modules))"
+        ).stdout.split()
+    except subprocess.CalledProcessError as e:
+        failures.append(f're-importing main.py as __mp_main__ failed:\n{e.stderr}')
+    else:
+        print(f'main.py as __mp_main__: ok, GUI modules loaded: {", ".join(leaked) or "none"}')
+        if leaked:
+            failures.append(f'main.py as __mp_main__ imports GUI modules: {", ".join(leaked)}')
+
+    available = [module for module in GUI_MODULES if importable(module)]
+    engine_rss = int(run(f'import engine; {RSS_PROBE}').stdout)
+    gui_rss = int(run(f'import engine, {", ".join(available)}; {RSS_PROBE}').stdout)
+    print(f'engine child RSS: {engine_rss / 2 ** 20:.1f} MiB')
+    print(f'with GUI imports: {gui_rss / 2 ** 20:.1f} MiB ({", ".join(available)})')
+
+    if failures:
+        sys.exit('\n'.join(failures))
+
+
+if __name__ == '__main__':
+    main()
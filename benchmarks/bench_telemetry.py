@@ -0,0 +1,71 @@
+import multiprocessing
+import sys
+from time import perf_counter
+from timeit import Timer as TimeIt
+
+from _common import make_config
+
+from SmoothedScroll.replay import Replay
+from SmoothedScroll.utils import TelemetryRing, generate_trace
+
+FREQUENCY = 144
+ROUNDS = 3
+WRITES = 500_000
+
+
+def session(config, **options):
+    replay = Replay(config, FREQUENCY, **options)
+    began = perf_counter()
+    replay.run(generate_trace(400, 0.05))
+    elapsed = perf_counter() - began
+    return elapsed
+
+
+def writer(name, count):
+    # every field derives from the sequence, so a torn record can't pass for a valid one
+    ring = TelemetryRing.attach(name)
+    for n in range(count):
+        ring.publish(n, n, -n, n % 7, n * 0.5)
+    ring.close()
+
+
+def main():
+    ring = TelemetryRing.create(capacity=256)
+    try:
+        publish = min(TimeIt(lambda: ring.publish(1.0, 3, -2, 4, 0.0001)).repeat(5, 100_000)) / 100_000
+        print(f'publish: {publish * 1e9:8.1f} ns per frame')
+
+        config = make_config()
+        session(config)
+        baseline = min(session(config) for _ in range(ROUNDS))
+        published = min(session(config, telemetry=ring.name) for _ in range(ROUNDS))
+        print(f'replay without telemetry: {baseline * 1e3:8.1f} ms')
+        print(f'replay with telemetry:    {published * 1e3:8.1f} ms ({(published / baseline - 1) * 100:+.1f}%)')
+
+        # a reader polling slower than the writer loses the oldest samples but never sees a torn one
+        process = multiprocessing.Process(target=writer, args=(ring.name, WRITES))
+        cursor = ring.written
+        base = cursor
+        process.start()
+        received = dropped = polls = 0
+        while process.is_alive() or cursor < base + WRITES:
+            samples, cursor, missed = ring.read(cursor)
+            polls += 1
+            received += len(samples)
+            dropped += missed
+            for sample in samples:
+                n = sample.vertical
+                if sample.horizontal != -n or sample.active != n % 7 or sample.lateness != n * 0.5 or sample.time != n:
+                    sys.exit(f'torn sample: {sample}')
+            if not process.is_alive() and cursor >= base + WRITES:
+                break
+        process.join()
+        print(f'cross-process: {received} samples read, {dropped} overwritten before a read, {polls} polls')
+        if received + dropped != WRITES:
+            sys.exit(f'{WRITES} samples written but {received} read and {dropped} dropped')
+    finally:
+        ring.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import random
+import sys
+from threading import Thread
+from time import perf_counter, sleep
+
+import _common  # puts the repo root on sys.path and sets APPDATA
+
+from SmoothedScroll.replay import percentile
+from SmoothedScroll.utils import Timer
+
+FREQUENCY = 144
+SESSION = 2  # seconds of frames per round
+ROUNDS = 5  # rounds per spin setting, interleaved so the host's noise spreads over all of them
+SPINS = (0, 0.0005, 0.001)
+
+
+def hook(latencies, until):
+    # stands in for the mouse hook thread: it wakes at random times and has to get the GIL back from the
+    # timer thread before it can run, which is the delay every wheel notch sees before push()
+    rng = random.Random(1)
+    while perf_counter() < until:
+        wake = perf_counter() + rng.uniform(0.0005, 0.004)
+        sleep(wake - perf_counter())
+        latencies.append(perf_counter() - wake)
+
+
+def run(spin):
+    timer = Timer(daemon=True, spin=spin)
+    timer.start()
+    interval = 1 / FREQUENCY
+    start = perf_counter() + 0.05
+    until = start + SESSION
+    deadlines = iter(range(1, FREQUENCY * SESSION))
+
+    def frame():
+        # rearms itself on the absolute grid, like the engine's frame task
+        index = next(deadlines, None)
+        if index is not None:
+            timer.set_deadline(frame, start + index * interval)
+
+    timer.set_deadline(frame, start)
+    latencies = []
+    thread = Thread(target=hook, args=(latencies, until))
+    thread.start()
+    thread.join()
+    timer.join()
+    return latencies, timer.stats.as_dict()
+
+
+def main():
+    hook_latencies = {spin: [] for spin in SPINS}
+    frame_lateness = {spin: [] for spin in SPINS}
+    for _ in range(ROUNDS):
+        for spin in SPINS:
+            latencies, stats = run(spin)
+            hook_latencies[spin] += latencies
+            frame_lateness[spin].append(stats['mean_lateness'])
+
+    print(f'{"spin ms":>8} {"hook mean us":>13} {"hook p50 us":>12} {"hook p90 us":>12} {"hook p99 us":>12} '
+          f'{"frame late us":>14}')
+    for spin in SPINS:
+        latencies = hook_latencies[spin]
+        print(f'{spin * 1e3:>8.1f} {sum(latencies) / len(latencies) * 1e6:>13.1f} '
+              f'{percentile(latencies, 50) * 1e6:>12.1f} {percentile(latencies, 90) * 1e6:>12.1f} '
+              f'{percentile(latencies, 99) * 1e6:>12.1f} {min(frame_lateness[spin]) * 1e6:>14.1f}')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
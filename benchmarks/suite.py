@@ -0,0 +1,221 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from time import time, perf_counter, sleep
+from statistics import median
+from timeit import Timer as TimeIt
+
+from _common import make_config, engine_config, NullSink
+
+from SmoothedScroll import SmoothedScroll, SmoothedScrollConfig, AppConfig
+from SmoothedScroll.SmoothedScroll import accelerate
+from SmoothedScroll.replay import NullSource
+from SmoothedScroll.utils import Timer, VirtualClock, VirtualTimer
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+THRESHOLD = 0.25  # a case regresses once it is this much slower than its baseline
+REPEAT = 7
+
+CASES = {}
+
+
+def case(name, tolerance=1.0):
+    # tolerance scales THRESHOLD for cases that are noisier than pure CPU work
+    def register(function):
+        CASES[name] = (function, tolerance)
+        return function
+    return register
+
+
+def per_call(function, number):
+    # best of REPEAT runs, in seconds per call
+    return min(TimeIt(function).repeat(REPEAT, number)) / number
+
+
+def make_engine(config, frequency=144):
+    clock = VirtualClock(start=1)
+    timer = VirtualTimer(clock)
+    engine = SmoothedScroll(
+        engine_config(config),
+        clock=clock, timer=timer, source=NullSource, sink=NullSink(), display_frequency=frequency
+    )
+    return engine, clock, timer
+
+
+@case('pulse')
+def bench_pulse():
+    engine, _, _ = make_engine(make_config())
+    return per_call(lambda: engine._pulse(0.37, 3.0), 200_000)
+
+
+@case('accelerate')
+def bench_accelerate():
+    # the branch scroll() takes for notches closer together than acceleration_delta
+    config = make_config()
+    return per_call(lambda: accelerate(120, 0.02, config), 200_000)
+
+
+def bench_frame(events):
+    # one animation frame with this many stacked impulses; the duration outlasts the run so none finish
+    config = make_config(duration=10 ** 8)
+    engine, clock, timer = make_engine(config)
+    for i in range(events):
+        engine.scroll(120, i % 4 == 0, config, clock() + i * 1e-6)
+    return per_call(timer.run_next, 2_000)
+
+
+for _events in (1, 16, 128):
+    case(f'frame_{_events}_events')(lambda events=_events: bench_frame(events))
+
+
+def app_configs(count):
+    scroll_config = make_config()
+    configs = []
+    for i in range(count):
+        if i % 2:
+            configs.append(AppConfig(path=f'C:/Program Files/App{i}/app{i}.exe', scroll_config=scroll_config))
+        else:
+            configs.append(AppConfig(regexp=rf'.*/tool{i}[a-z]*\.exe', scroll_config=scroll_config))
+    return configs
+
+
+@case('app_config_match_200')
+def bench_app_config_match():
+    # the uncached path: what every new window's exe costs before the matcher memoizes it
+    config = SmoothedScrollConfig(app_configs(200))
+    paths = [f'C:/Program Files/App{i}/app{i}.exe' for i in range(0, 400, 7)] + ['C:/Windows/explorer.exe']
+    return per_call(lambda: [config.matcher._match_index(path) for path in paths], 500) / len(paths)
+
+
+@case('app_config_match_memo')
+def bench_app_config_memo():
+    config = SmoothedScrollConfig(app_configs(200))
+    path = 'C:/Program Files/App101/app101.exe'
+    config.match(path)
+    return per_call(lambda: config.match(path), 200_000)
+
+
+@case('timer_wakeup_lateness', tolerance=20.0)
+def bench_timer_wakeup():
+    # mean lateness of a real Timer thread over a run of 144 Hz deadlines; it swings several times over with
+    # the OS scheduler, so only a lost spin-wait (milliseconds late) counts as a regression
+    timer = Timer(daemon=True)
+    timer.start()
+    interval = 1 / 144
+    start = perf_counter() + 0.01
+    for i in range(100):
+        timer.set_deadline(lambda: None, start + i * interval)
+    sleep(100 * interval + 0.05)
+    timer.join()
+    return timer.stats.as_dict()['mean_lateness']
+
+
+def scratch_blocklist():
+    # APPDATA is always set on Windows, so the cases point utils.blocklist at a temp file and never at the
+    # user's real blocklist
+    from utils import blocklist
+    blocklist.BLOCKLIST_PATH = os.path.join(tempfile.mkdtemp(), 'blocklist.json')
+    blocklist.write_blocklist([f'game{i}.exe' for i in range(10_000)])
+    return blocklist
+
+
+@case('blocklist_load_10k')
+def bench_blocklist_load():
+    blocklist = scratch_blocklist()
+    return per_call(blocklist.load_blocklist, 50)
+
+
+@case('blocklist_toggle_10k')
+def bench_blocklist_toggle():
+    blocklist = scratch_blocklist()
+    return per_call(lambda: blocklist.toggle_blocklist('game5000.exe'), 50)
+
+
+def run(names=None, runs=1):
+    # each case's result is the median of runs separate runs
+    results = {}
+    for name, (function, _) in CASES.items():
+        if names and name not in names:
+            continue
+        results[name] = median(function() for _ in range(runs))
+        print(f'{name:>24}: {results[name] * 1e6:12.3f} us', file=sys.stderr)
+    return {
+        'meta': {
+            'time': time(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=THRESHOLD):
+    # returns the names of cases that got slower than their baseline allows
+    regressions = []
+    print(f'{"case":>24} {"baseline us":>12} {"current us":>12} {"ratio":>7}')
+    for name, value in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f'{name:>24} {"-":>12} {value * 1e6:12.3f} {"new":>7}')
+            continue
+        ratio = value / base if base else 1
+        limit = 1 + threshold * CASES.get(name, (None, 1.0))[1]
+        flag = '  REGRESSED' if ratio > limit else ''
+        print(f'{name:>24} {base * 1e6:12.3f} {value * 1e6:12.3f} {ratio:7.2f}{flag}')
+        if ratio > limit:
+            regressions.append(name)
+    return regressions
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save(path, results):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2)
+        file.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmarks for the SmoothedScroll hot paths')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the suite and write the results as JSON')
+    run_parser.add_argument('-o', '--output', help='results file, stdout when omitted')
+    run_parser.add_argument('--runs', type=int, default=1)
+    run_parser.add_argument('cases', nargs='*', help='only run these cases')
+
+    baseline_parser = commands.add_parser('baseline', help='run the suite and store it as the baseline')
+    baseline_parser.add_argument('--baseline', default=BASELINE_PATH)
+    baseline_parser.add_argument('--runs', type=int, default=3)
+
+    compare_parser = commands.add_parser('compare', help='fail when results regress against the baseline')
+    compare_parser.add_argument('results', nargs='?', help='results file, a fresh run when omitted')
+    compare_parser.add_argument('--baseline', default=BASELINE_PATH)
+    compare_parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    compare_parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        results = run(args.cases, args.runs)
+        if args.output:
+            save(args.output, results)
+        else:
+            print(json.dumps(results, indent=2))
+    elif args.command == 'baseline':
+        save(args.baseline, run(runs=args.runs))
+    else:
+        current = load(args.results) if args.results else run(runs=args.runs)
+        regressions = compare(current, load(args.baseline), args.threshold)
+        if regressions:
+            sys.exit(f'regressed beyond {args.threshold:.0%}: {", ".join(regressions)}')
+
+
+if __name__ == '__main__':
+    main()
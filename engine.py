@@ -0,0 +1,13 @@
+# entry point of the engine process. Spawned children re-import the parent's __main__ module, so main.py
+# imports the GUI only when run as the app and this module imports only what the hook and animation need
+from SmoothedScroll import SmoothedScroll, SmoothedScrollConfig
+
+
+def smoothed_scroll_task(config: SmoothedScrollConfig, control=None, blocklist_path=None, telemetry=None):
+    try:
+        smoothed_scroll_instance = SmoothedScroll(
+            config=config, blocklist_path=blocklist_path, control=control, telemetry=telemetry
+        )
+        smoothed_scroll_instance.start(is_block=True)
+    except Exception as e:
+        print(f"Error in SmoothedScroll process: {e}")
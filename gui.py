@@ -0,0 +1,443 @@
+import os
+import sys
+import multiprocessing
+import threading
+import time
+from collections import deque
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+import sv_ttk
+import easing_functions
+import pystray
+from pystray import MenuItem as item
+from PIL import Image
+
+from engine import smoothed_scroll_task
+from SmoothedScroll import SmoothedScrollConfig, AppConfig, ScrollConfig
+from SmoothedScroll.models import VK_SHIFT
+from SmoothedScroll.utils import BlocklistWatcher, TelemetryRing, CurveTable
+from utils.blocklist import write_blocklist, toggle_blocklist
+from utils.config import load_config, save_config, DEFAULT_CONFIG 
+from utils.find_games import GameWatcher
+from utils.process_index import ProcessNameIndex
+
+BLOCKLIST_PATH = os.path.join(os.getenv('APPDATA'), 'SmoothedScroll', 'blocklist.json')
+APP_DATA_PATH = os.path.join(os.getenv('APPDATA'), 'SmoothedScroll')
+ICON_PATH = os.path.join(os.path.dirname(__file__), 'assets', 'icon.ico')
+WM_RBUTTONUP = 0x0205
+PROFILE_DURATION = 10
+CONTROL_TIMEOUT = 2  # seconds to wait for the engine to acknowledge a command
+TELEMETRY_POLL_MS = 50
+TELEMETRY_SAMPLES = 240  # frames kept in the settings plot
+
+class ScrollConfigApp:
+    instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls.instance is None:
+            cls.instance = super(ScrollConfigApp, cls).__new__(cls)
+        return cls.instance
+
+    def __init__(self):
+        if hasattr(self, 'initialized') and self.initialized:
+            return
+        self.initialized = True
+        self.config = load_config()  
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.create_variables()
+        self.smoothed_scroll_process = None
+        self.control_connection = None
+        self.action_button = None
+        self.window_built = False
+        self.smooth_scroll_started = False
+        self.telemetry = None
+        self.telemetry_cursor = 0
+        self.telemetry_samples = deque(maxlen=TELEMETRY_SAMPLES)
+        self.telemetry_canvas = None
+
+    def build_window(self):
+        # most sessions never open Settings, so the themed widgets are only created on the first show()
+        self.root.title("Smoothed Scroll Settings")
+        self.root.iconbitmap(ICON_PATH)
+        self.root.geometry("400x1070")
+        self.root.resizable(False, False)
+        self.center_window()
+        sv_ttk.set_theme(self.config.get("theme", "dark"))
+        self.setup_gui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.window_built = True
+        self.set_smooth_scroll_started(self.smooth_scroll_started)
+
+    def create_variables(self):
+        self.distance_var = tk.IntVar(value=self.config.get("scroll_distance", 120))
+        self.acceleration_var = tk.DoubleVar(value=self.config.get("acceleration", 1.0))
+        self.opposite_acceleration_var = tk.DoubleVar(value=self.config.get("opposite_acceleration", 1.2))
+        self.acceleration_delta_var = tk.IntVar(value=self.config.get("acceleration_delta", 70))
+        self.acceleration_max_var = tk.IntVar(value=self.config.get("acceleration_max", 14))
+        self.duration_var = tk.IntVar(value=self.config.get("scroll_duration", 500))
+        self.pulse_scale_var = tk.DoubleVar(value=self.config.get("pulse_scale", 3.0))
+        self.inverted_scroll_var = tk.BooleanVar(value=self.config.get("inverted_scroll", False))
+        self.theme_var = tk.StringVar(value=self.config.get("theme", "dark"))
+        self.autostart_var = tk.BooleanVar(value=self.config.get("autostart", False))
+
+    def center_window(self):
+        self.root.update_idletasks()
+        width = self.root.winfo_width()
+        height = self.root.winfo_height()
+        x = (self.root.winfo_screenwidth() // 2) - (width // 2)
+        y = (self.root.winfo_screenheight() // 2) - (height // 2)
+        self.root.geometry(f"{width}x{height}+{x}+{y}")
+
+    def setup_gui(self):
+        frame = ttk.LabelFrame(self.root, text="Scroll Settings")
+        frame.pack(padx=10, pady=10, fill="x")
+        self.create_scroll_settings(frame)
+
+        theme_frame = ttk.LabelFrame(self.root, text="Theme Settings")
+        theme_frame.pack(padx=10, pady=10, fill="x")
+        self.create_theme_settings(theme_frame)
+
+        other_frame = ttk.LabelFrame(self.root, text="Other")
+        other_frame.pack(padx=10, pady=10, fill="x")
+        self.create_donation_link(other_frame)
+        self.create_autostart_option(frame)
+
+        telemetry_frame = ttk.LabelFrame(self.root, text="Live Telemetry")
+        telemetry_frame.pack(padx=10, pady=10, fill="x")
+        self.create_telemetry_plot(telemetry_frame)
+
+    def create_scroll_settings(self, frame):
+        ttk.Label(frame, text="Scroll Distance (px):").pack(anchor="w", padx=5, pady=5)
+        ttk.Spinbox(frame, from_=0, to=2000, textvariable=self.distance_var).pack(anchor="w", fill="x", padx=5, pady=5)
+        ttk.Label(frame, text="Acceleration (x):").pack(anchor="w", padx=5, pady=5)
+        ttk.Entry(frame, textvariable=self.acceleration_var).pack(anchor="w", fill="x", padx=5, pady=5)
+        ttk.Label(frame, text="Opposite Acceleration (x):").pack(anchor="w", padx=5, pady=5)
+        ttk.Entry(frame, textvariable=self.opposite_acceleration_var).pack(anchor="w", fill="x", padx=5, pady=5)
+        ttk.Label(frame, text="Acceleration Delta (ms):").pack(anchor="w", padx=5, pady=5)
+        ttk.Entry(frame, textvariable=self.acceleration_delta_var).pack(anchor="w", fill="x", padx=5, pady=5)
+        ttk.Label(frame, text="Max Acceleration Steps:").pack(anchor="w", padx=5, pady=5)
+        ttk.Spinbox(frame, from_=0, to=30, textvariable=self.acceleration_max_var).pack(anchor="w", fill="x", padx=5, pady=5)
+        ttk.Label(frame, text="Scroll Duration (ms):").pack(anchor="w", padx=5, pady=5)
+        ttk.Spinbox(frame, from_=0, to=1000, textvariable=self.duration_var).pack(anchor="w", fill="x", padx=5, pady=5)
+        ttk.Label(frame, text="Pulse Scale (x):").pack(anchor="w", padx=5, pady=5)
+        ttk.Entry(frame, textvariable=self.pulse_scale_var).pack(anchor="w", fill="x", padx=5, pady=5)
+        ttk.Checkbutton(frame, text="Inverted Scroll", variable=self.inverted_scroll_var).pack(anchor="w", padx=5, pady=5)
+        self.action_button = ttk.Button(frame, text="Start Smoothed Scroll", command=self.toggle_smoothed_scroll)
+        self.action_button.pack(fill="x", pady=5)
+        ttk.Button(frame, text="Apply Settings", command=self.apply_settings).pack(fill="x", pady=5)
+        ttk.Button(frame, text="Reset to Default", command=self.reset_to_default).pack(fill="x", pady=5)
+
+    def create_theme_settings(self, frame):
+        ttk.Radiobutton(frame, text="Dark Theme", variable=self.theme_var, value="dark", command=self.apply_theme).pack(anchor="w", padx=5, pady=5)
+        ttk.Radiobutton(frame, text="Light Theme", variable=self.theme_var, value="light", command=self.apply_theme).pack(anchor="w", padx=5, pady=5)
+
+    def create_autostart_option(self, frame):
+        ttk.Checkbutton(frame, text="Enable Autostart", variable=self.autostart_var, command=self.toggle_autostart).pack(anchor="w", padx=5, pady=5)
+
+    def create_telemetry_plot(self, frame):
+        self.telemetry_canvas = tk.Canvas(frame, height=100, highlightthickness=0, background="#202020")
+        self.telemetry_canvas.pack(fill="x", padx=5, pady=5)
+        ttk.Label(frame, text="Green: scrolled px per frame, orange: frame lateness").pack(anchor="w", padx=5)
+        self.root.after(TELEMETRY_POLL_MS, self.poll_telemetry)
+
+    def poll_telemetry(self):
+        # reads whatever frames the engine published since the last poll; the engine never waits on this
+        if self.telemetry is not None and self.root.winfo_viewable():
+            samples, self.telemetry_cursor, _ = self.telemetry.read(self.telemetry_cursor)
+            if samples:
+                self.telemetry_samples.extend(samples)
+                self.draw_telemetry()
+        self.root.after(TELEMETRY_POLL_MS, self.poll_telemetry)
+
+    def draw_telemetry(self):
+        canvas = self.telemetry_canvas
+        canvas.delete("all")
+        width = canvas.winfo_width()
+        height = canvas.winfo_height() - 2
+        step = width / TELEMETRY_SAMPLES
+        speeds = [abs(sample.vertical) + abs(sample.horizontal) for sample in self.telemetry_samples]
+        lateness = [max(sample.lateness, 0) for sample in self.telemetry_samples]
+        for values, color in ((speeds, "#4caf50"), (lateness, "#ff9800")):
+            peak = max(values) or 1
+            points = []
+            for i, value in enumerate(values):
+                points += (i * step, height - value / peak * height + 1)
+            if len(points) >= 4:
+                canvas.create_line(*points, fill=color)
+
+    def create_donation_link(self, frame):
+        ttk.Button(frame, text="Support me", command=self.open_donation_link).pack(anchor="w", padx=5, pady=5)
+
+    def open_donation_link(self):
+        import webbrowser
+        webbrowser.open("https://www.donationalerts.com/r/zachey")
+
+    def toggle_smoothed_scroll(self):
+        # Stop only pauses the engine; Start goes through apply_settings, so settings edited while it was
+        # running are saved and sent to it before it resumes
+        if self.is_smoothed_scroll_alive() and self.smooth_scroll_started:
+            self.pause_smoothed_scroll()
+        else:
+            self.apply_settings()
+
+    def is_smoothed_scroll_alive(self):
+        return bool(self.smoothed_scroll_process and self.smoothed_scroll_process.is_alive())
+
+    def send_command(self, command, payload=None, wait=False):
+        # the running engine applies commands between animation frames, see SmoothedScroll.utils.ControlChannel;
+        # with wait, returns whether it acknowledged applying the command
+        try:
+            self.control_connection.send((command, payload, wait))
+            while wait:
+                if not self.control_connection.poll(CONTROL_TIMEOUT):
+                    print(f"SmoothedScroll process did not acknowledge {command}")
+                    return False
+                # skips the engine's ('ready', None) greeting and acknowledgements nobody waited for
+                status, replied, *detail = self.control_connection.recv()
+                if replied == command:
+                    if status != "done":
+                        print(f"SmoothedScroll process rejected {command}: {detail}")
+                    return status == "done"
+            return True
+        except (AttributeError, OSError, EOFError) as e:
+            print(f"Error sending {command} to SmoothedScroll process: {e}")
+            return False
+
+    def apply_settings(self):
+        try:
+            smoothed_scroll_config = self.build_smoothed_scroll_config()
+            self.check_smoothed_scroll_config(smoothed_scroll_config)
+        except (tk.TclError, ValueError, ArithmeticError) as e:
+            messagebox.showerror("Smoothed Scroll", f"Invalid settings: {e}")
+            return
+        self.config["scroll_distance"] = self.distance_var.get()
+        self.config["acceleration"] = self.acceleration_var.get()
+        self.config["opposite_acceleration"] = self.opposite_acceleration_var.get()
+        self.config["acceleration_delta"] = self.acceleration_delta_var.get()
+        self.config["acceleration_max"] = self.acceleration_max_var.get()
+        self.config["scroll_duration"] = self.duration_var.get()
+        self.config["pulse_scale"] = self.pulse_scale_var.get()
+        self.config["inverted_scroll"] = self.inverted_scroll_var.get()
+        self.config["autostart"] = self.autostart_var.get()
+        save_config(self.config) 
+        if self.is_smoothed_scroll_alive() and self.send_command("config", smoothed_scroll_config, wait=True):
+            self.resume_smoothed_scroll()
+        else:
+            self.stop_smoothed_scroll()
+            self.start_smoothed_scroll()
+
+    def toggle_autostart(self):
+        self.config["autostart"] = self.autostart_var.get()
+        save_config(self.config) 
+        self.manage_autostart()
+
+    def manage_autostart(self):
+        startup_folder = os.path.join(os.getenv('APPDATA'), 'Microsoft', 'Windows', 'Start Menu', 'Programs', 'Startup')
+        exe_path = os.path.abspath(sys.argv[0])
+        shortcut_path = os.path.join(startup_folder, "SmoothedScroll.lnk")
+
+        if self.config["autostart"]:
+            self.create_shortcut(exe_path, shortcut_path)
+        else:
+            try:
+                os.remove(shortcut_path)
+            except FileNotFoundError:
+                pass
+
+    def create_shortcut(self, exe_path, shortcut_path):
+        import winshell  
+        with winshell.shortcut(shortcut_path) as shortcut:
+            shortcut.path = exe_path
+            shortcut.working_directory = os.path.dirname(exe_path)
+            shortcut.description = "Smoothed Scroll Autostart"
+            shortcut.icon_location = (exe_path, 0)
+
+    def apply_theme(self):
+        theme = self.theme_var.get()
+        sv_ttk.set_theme(theme)
+        self.config["theme"] = theme
+        save_config(self.config) 
+
+    def build_smoothed_scroll_config(self):
+        app_configs = [
+            AppConfig(
+                regexp=r'.*',
+                scroll_config=ScrollConfig(
+                    distance=self.distance_var.get(),
+                    acceleration=self.acceleration_var.get(),
+                    opposite_acceleration=self.opposite_acceleration_var.get(),
+                    acceleration_delta=self.acceleration_delta_var.get(),
+                    acceleration_max=self.acceleration_max_var.get(),
+                    duration=self.duration_var.get(),
+                    pulse_scale=self.pulse_scale_var.get(),
+                    ease=easing_functions.LinearInOut,
+                    inverted=self.inverted_scroll_var.get(),
+                    horizontal_scroll_key=VK_SHIFT
+                ),
+            )
+        ]
+        return SmoothedScrollConfig(app_config=app_configs)
+
+    def check_smoothed_scroll_config(self, smoothed_scroll_config):
+        # the engine builds these curves as it applies a config; building them here first turns a value they
+        # can't be built for, such as a pulse scale of 0, into an error message instead of a broken engine
+        for app_config in smoothed_scroll_config.app_configs:
+            scroll_config = app_config.scroll_config
+            CurveTable(scroll_config.pulse_scale, scroll_config.ease, scroll_config.duration)
+
+    def start_smoothed_scroll(self):
+        if self.is_smoothed_scroll_alive():
+            return
+        self.control_connection, engine_connection = multiprocessing.Pipe()
+        if self.telemetry is None:
+            # kept for the whole session; a restarted engine attaches to it and carries on the sample count
+            self.telemetry = TelemetryRing.create()
+        self.smoothed_scroll_process = multiprocessing.Process(
+            target=smoothed_scroll_task,
+            args=(self.build_smoothed_scroll_config(), engine_connection, BLOCKLIST_PATH, self.telemetry.name),
+            daemon=True
+        )
+        self.smoothed_scroll_process.start()
+        engine_connection.close()
+        self.set_smooth_scroll_started(True)
+
+    def capture_profile(self):
+        # the engine samples its own threads and writes collapsed stacks next to the config; sending it again
+        # while a capture runs ends it early
+        path = os.path.join(APP_DATA_PATH, time.strftime("engine-profile-%Y%m%d-%H%M%S.collapsed"))
+        self.send_command("profile", {"path": path, "duration": PROFILE_DURATION})
+
+    def pause_smoothed_scroll(self):
+        if self.send_command("pause"):
+            self.set_smooth_scroll_started(False)
+
+    def resume_smoothed_scroll(self):
+        if self.send_command("resume"):
+            self.set_smooth_scroll_started(True)
+
+    def set_smooth_scroll_started(self, started):
+        self.smooth_scroll_started = started
+        if self.action_button is not None:
+            self.action_button.config(text="Stop Smoothed Scroll" if started else "Start Smoothed Scroll")
+
+    def stop_smoothed_scroll(self):
+        if self.is_smoothed_scroll_alive():
+            try:
+                self.send_command("stop")
+                self.smoothed_scroll_process.join(timeout=1)
+                if self.smoothed_scroll_process.is_alive():
+                    self.smoothed_scroll_process.terminate()
+                    self.smoothed_scroll_process.join(timeout=5)
+            except Exception as e:
+                print(f"Error terminating SmoothedScroll process: {e}")
+            finally:
+                self.smoothed_scroll_process = None
+                self.control_connection = None
+                self.set_smooth_scroll_started(False)
+
+    def reset_to_default(self):
+        self.config = DEFAULT_CONFIG.copy()
+        self.create_variables()
+        self.apply_theme()
+
+    def on_closing(self):
+        if not self.config.get("message_shown", False):
+            messagebox.showinfo(
+                "Smoothed Scroll",
+                "Smoothed Scroll is running from the system tray."
+            )
+            self.config["message_shown"] = True
+            save_config(self.config)
+        self.root.withdraw()
+
+    def show(self):
+        self.root.after(0, self._show)
+
+    def _show(self):
+        if not self.window_built:
+            self.build_window()
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
+
+    def exit_app(self):
+        self.stop_smoothed_scroll()
+        if self.telemetry is not None:
+            self.telemetry.close()
+        self.root.quit()
+        os._exit(0)
+
+def load_icon():
+    try:
+        return Image.open(ICON_PATH)
+    except Exception as e:
+        print(f"Error loading icon: {e}")
+        return None
+
+class TrayIcon(pystray.Icon):
+    # the win32 backend turns the menu into a native one up front and only shows it on right click,
+    # so the menu is rebuilt right before that and the Exceptions submenu enumerates windows only then
+    menu_opened = False
+
+    def _on_notify(self, wparam, lparam):
+        if lparam == WM_RBUTTONUP:
+            self.menu_opened = True
+            self.update_menu()
+        super()._on_notify(wparam, lparam)
+
+def build_exception_items(icon, processes, blocklist):
+    if not icon.menu_opened:
+        return []
+    blocklist.reload()
+    return [
+        item(process, lambda _, p=process: toggle_blocklist(p),
+             checked=lambda item, p=process: blocklist.is_blocked(p)) for process in processes.refresh()
+    ]
+
+def build_menu(icon, app_instance):
+    processes = ProcessNameIndex()
+    blocklist = BlocklistWatcher(BLOCKLIST_PATH)
+
+    def action_text(_):
+        if not app_instance.is_smoothed_scroll_alive() or not app_instance.smooth_scroll_started:
+            return "Start Smoothed Scroll"
+        return "Stop Smoothed Scroll"
+
+    icon.menu = pystray.Menu(
+        item(action_text, lambda _: app_instance.toggle_smoothed_scroll()),
+        item('Exceptions', pystray.Menu(lambda: build_exception_items(icon, processes, blocklist))),
+        item('Open Settings', lambda _: app_instance.show()),
+        item(f'Capture Engine Profile ({PROFILE_DURATION} s)', lambda _: app_instance.capture_profile(),
+             visible=lambda _: app_instance.is_smoothed_scroll_alive()),
+        item('Exit', lambda _: (app_instance.exit_app(), icon.stop()))
+    )
+
+def run_tray(app_instance):
+    icon_image = load_icon()
+    if icon_image is None:
+        return
+    icon = TrayIcon("SmoothedScroll", icon_image, "Smoothed Scroll")
+    build_menu(icon, app_instance)
+    icon.run()
+
+def stop_icon(icon):
+    icon.stop()
+
+def run_system_tray(app_instance):
+    tray_thread = threading.Thread(target=run_tray, args=(app_instance,), daemon=True)
+    tray_thread.start()
+
+def start_taskbar_icon():
+    if not os.path.exists(APP_DATA_PATH):
+        os.makedirs(APP_DATA_PATH, exist_ok=True)
+    if not os.path.exists(BLOCKLIST_PATH):
+        write_blocklist([])
+
+def main():
+    app = ScrollConfigApp()
+    start_taskbar_icon()
+    GameWatcher(daemon=True).start()
+    run_system_tray(app)
+    app.root.mainloop()
\ No newline at end of file
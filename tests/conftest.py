@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# the tests import the engine and utils from the repo root like the app does; APPDATA is always set on Windows
+# and utils builds its paths from it on import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('APPDATA', tempfile.mkdtemp())
@@ -0,0 +1,123 @@
+from SmoothedScroll.utils import AppQuery, AppPathCache, VirtualClock
+
+
+class FakeAppQuery(AppQuery):
+    # windows belong to pids, pids run exes; processes can exit and their windows be taken over
+    def __init__(self):
+        self.windows = {}
+        self.exes = {}
+        self.exited = set()
+        self.cursor = None
+        self.opened = 0
+        self.open_handles = set()
+
+    def cursor_window(self):
+        return self.cursor
+
+    def window_pid(self, hwnd):
+        return self.windows[hwnd]
+
+    def open_process(self, pid):
+        self.opened += 1
+        handle = (pid, self.opened)
+        self.open_handles.add(handle)
+        return handle
+
+    def process_path(self, handle):
+        return self.exes[handle[0]]
+
+    def has_exited(self, handle):
+        return handle[0] in self.exited
+
+    def close(self, handle):
+        self.open_handles.discard(handle)
+
+
+def apps(count, windows_each=1):
+    query = FakeAppQuery()
+    for pid in range(count):
+        query.exes[pid] = f'C:\\Apps\\app{pid}.exe'
+        for hwnd in range(pid * 100, pid * 100 + windows_each):
+            query.windows[hwnd] = pid
+    return query
+
+
+def test_paths_are_normalized_and_resolved_once_per_process():
+    query = apps(5, windows_each=4)
+    cache = AppPathCache(query, clock=VirtualClock())
+    hwnds = sorted(query.windows)
+    for i in range(1_000):
+        hwnd = hwnds[i * 7 % len(hwnds)]
+        assert cache.app_path(hwnd) == f'C:/Apps/app{hwnd // 100}.exe'
+    assert cache.misses == query.opened == 5
+    assert cache.hits == 995
+
+
+def test_current_app_path_follows_the_cursor():
+    query = apps(2)
+    cache = AppPathCache(query, clock=VirtualClock())
+    query.cursor = 100
+    assert cache.current_app_path() == 'C:/Apps/app1.exe'
+
+
+def test_new_windows_of_a_cached_process_are_hits_and_bounded():
+    query = FakeAppQuery()
+    query.exes[1] = 'C:/Apps/browser.exe'
+    query.windows = {hwnd: 1 for hwnd in range(10_000)}
+    cache = AppPathCache(query, max_windows=256, clock=VirtualClock())
+    for hwnd in range(10_000):
+        cache.app_path(hwnd)
+    stats = cache.stats()
+    assert stats['windows'] == 256
+    assert stats['hits'] == 9_999
+    assert stats['misses'] == 1
+
+
+def test_processes_are_evicted_least_recently_used():
+    query = apps(5)
+    cache = AppPathCache(query, max_processes=4, clock=VirtualClock())
+    for hwnd in (0, 100, 200, 300, 0, 400):
+        cache.app_path(hwnd)
+    # the first process was looked up again just before the cache overflowed, so the second one went
+    assert cache.stats()['processes'] == 4
+    assert {handle[0] for handle in query.open_handles} == {0, 2, 3, 4}
+    opened = query.opened
+    cache.app_path(0)
+    assert query.opened == opened
+    cache.app_path(100)
+    assert query.opened == opened + 1
+
+
+def test_windows_are_evicted_least_recently_used():
+    query = apps(1, windows_each=3)
+    cache = AppPathCache(query, max_windows=2, clock=VirtualClock())
+    for hwnd in (0, 1, 0, 2):
+        cache.app_path(hwnd)
+    assert list(cache._windows) == [0, 2]
+
+
+def test_exited_process_is_noticed_once_revalidate_elapses():
+    query = FakeAppQuery()
+    query.exes.update({1: 'C:/Apps/old.exe', 2: 'C:/Apps/new.exe'})
+    query.windows[10] = 1
+    clock = VirtualClock()
+    cache = AppPathCache(query, revalidate=1.0, clock=clock)
+    assert cache.app_path(10) == 'C:/Apps/old.exe'
+    query.exited.add(1)
+    query.windows[10] = 2
+    assert cache.app_path(10) == 'C:/Apps/old.exe'
+    clock.advance(1.5)
+    assert cache.app_path(10) == 'C:/Apps/new.exe'
+    assert cache.invalidations == 1
+    assert {handle[0] for handle in query.open_handles} == {2}
+
+
+def test_evicted_and_cleared_processes_close_their_handles():
+    query = apps(10)
+    cache = AppPathCache(query, max_processes=4, clock=VirtualClock())
+    for pid in range(10):
+        cache.app_path(pid * 100)
+    assert len(query.open_handles) == 4
+    cache.clear()
+    assert not query.open_handles
+    assert cache.stats()['windows'] == 0
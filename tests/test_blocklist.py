@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from SmoothedScroll.utils import BlocklistWatcher
+from utils import blocklist
+
+
+@pytest.fixture
+def blocklist_path(tmp_path, monkeypatch):
+    path = tmp_path / 'blocklist.json'
+    monkeypatch.setattr(blocklist, 'BLOCKLIST_PATH', str(path))
+    return path
+
+
+def test_toggle_ignores_case(blocklist_path):
+    assert blocklist.toggle_blocklist('Game.exe') == ['game.exe']
+    assert blocklist.toggle_blocklist('GAME.EXE') == []
+    assert json.loads(blocklist_path.read_text(encoding='utf-8')) == []
+
+
+def test_entries_written_in_another_case_are_read_as_one(blocklist_path):
+    # a list saved before names were normalised
+    blocklist_path.write_text(json.dumps(['Game.exe', 'game.exe', 'Other.EXE']), encoding='utf-8')
+    assert blocklist.load_blocklist() == ['game.exe', 'game.exe', 'other.exe']
+    assert blocklist.toggle_blocklist('GAME.exe') == ['other.exe']
+
+
+def test_watcher_agrees_with_the_toggle(blocklist_path):
+    # the tray menu's checkmark reads the watcher, the menu item toggles the file
+    watcher = BlocklistWatcher(str(blocklist_path))
+    blocklist.toggle_blocklist('Game.exe')
+    watcher.reload()
+    assert watcher.is_blocked('Game.exe')
+    assert watcher.is_blocked('C:/Games/GAME.exe')
+    assert not watcher.is_blocked('other.exe')
+
+
+def test_add_reports_only_names_not_listed_in_any_case(blocklist_path):
+    blocklist.write_blocklist(['game.exe'])
+    assert blocklist.add_to_blocklist({'Game.exe', 'New.exe'}) == {'new.exe'}
+    assert blocklist.load_blocklist() == ['game.exe', 'new.exe']
@@ -0,0 +1,81 @@
+from multiprocessing import Pipe
+from time import perf_counter, sleep
+
+import easing_functions
+import pytest
+
+from SmoothedScroll import SmoothedScroll, SmoothedScrollConfig, AppConfig, ScrollConfig
+from SmoothedScroll.replay import NullSource
+
+APP_PATH = 'C:/Apps/app.exe'
+
+
+def engine_config(distance, duration=50, pulse_scale=3.0, inverted=False):
+    # no acceleration, so each notch scrolls exactly the configured distance however close the last one was
+    return SmoothedScrollConfig(AppConfig(regexp=r'.*', scroll_config=ScrollConfig(
+        distance, 1.0, 1.2, 0, 14, duration, pulse_scale, easing_functions.LinearInOut, inverted
+    )))
+
+
+@pytest.fixture
+def engine():
+    # a running headless engine on a real timer thread, commanded over a pipe the way the settings window does
+    connection, engine_connection = Pipe()
+    emitted = []
+    engine = SmoothedScroll(
+        engine_config(120), source=NullSource, sink=lambda delta, is_horizontal: emitted.append(delta),
+        display_frequency=144, control=engine_connection
+    )
+    engine.start(is_block=False)
+    assert connection.recv() == ('ready', None)
+    yield engine, connection, emitted
+    connection.send(('stop', None, False))
+    engine._control.join(timeout=1)
+
+
+def notch(engine, emitted):
+    # what the mouse hook does with one wheel notch over an app, then waits for the animation to finish
+    emitted.clear()
+    scroll_config = engine.get_config().match(APP_PATH)
+    engine.push(-1 if scroll_config.inverted else 1, False, scroll_config)
+    deadline = perf_counter() + 2
+    while (engine._pending or not emitted) and perf_counter() < deadline:
+        sleep(0.005)
+    return sum(emitted)
+
+
+def scrolled(distance):
+    # the carry below a pixel is dropped when an animation ends, so the total can come out one short
+    return pytest.approx(distance, abs=1)
+
+
+def command(connection, name, payload=None):
+    connection.send((name, payload, True))
+    return connection.recv()
+
+
+def test_changed_settings_reach_the_running_engine(engine):
+    engine, connection, emitted = engine
+    assert notch(engine, emitted) == scrolled(120)
+    assert command(connection, 'config', engine_config(300, inverted=True)) == ('done', 'config')
+    assert notch(engine, emitted) == scrolled(-300)
+
+
+def test_rejected_config_keeps_the_previous_one(engine):
+    engine, connection, emitted = engine
+    reply = command(connection, 'config', engine_config(300, pulse_scale=0))
+    assert reply[:2] == ('error', 'config')
+    assert 'ZeroDivisionError' in reply[2]
+    # the timer thread survived the bad config and still runs frames
+    assert notch(engine, emitted) == scrolled(120)
+    assert command(connection, 'config', engine_config(200)) == ('done', 'config')
+    assert notch(engine, emitted) == scrolled(200)
+
+
+def test_pause_and_resume(engine):
+    engine, connection, _ = engine
+    assert command(connection, 'pause') == ('done', 'pause')
+    assert engine._listener.paused
+    assert command(connection, 'resume') == ('done', 'resume')
+    assert not engine._listener.paused
+    assert command(connection, 'bogus') == ('unknown', 'bogus')
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from utils import blocklist
+from utils.find_games import GameWatcher
+
+
+class FakeProcessTable:
+    def __init__(self):
+        self.processes = {1: ('steam.exe', 'C:/Steam/steam.exe', 0), 2: ('explorer.exe', 'C:/Windows/explorer.exe', 0)}
+        self.next_pid = 3
+
+    def spawn(self, name, ppid=1):
+        self.processes[self.next_pid] = (name, f'C:/Games/{name}', ppid)
+        self.next_pid += 1
+
+    def pids(self):
+        return list(self.processes)
+
+    def info(self, pid):
+        return self.processes.get(pid)
+
+
+@pytest.fixture
+def blocklist_path(tmp_path, monkeypatch):
+    path = tmp_path / 'blocklist.json'
+    monkeypatch.setattr(blocklist, 'BLOCKLIST_PATH', str(path))
+    return path
+
+
+def saved(path):
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def test_new_games_are_added_once(blocklist_path):
+    table = FakeProcessTable()
+    watcher = GameWatcher(process_table=table)
+    assert watcher.poll() == set()
+    table.spawn('game.exe')
+    assert watcher.poll() == {'game.exe'}
+    assert watcher.poll() == set()
+    assert saved(blocklist_path) == ['game.exe']
+
+
+def test_write_failure_is_reported(blocklist_path, monkeypatch):
+    monkeypatch.setattr(blocklist, 'BLOCKLIST_PATH', str(blocklist_path.parent / 'missing' / 'blocklist.json'))
+    assert blocklist.write_blocklist(['game.exe']) is False
+    assert blocklist.toggle_blocklist('game.exe') == []
+
+
+def test_unsaved_games_are_retried(blocklist_path, monkeypatch):
+    table = FakeProcessTable()
+    watcher = GameWatcher(process_table=table)
+    watcher.poll()
+
+    monkeypatch.setattr(blocklist, 'BLOCKLIST_PATH', str(blocklist_path.parent / 'missing' / 'blocklist.json'))
+    table.spawn('game.exe')
+    assert watcher.poll() == set()
+
+    # the game's process is no longer new, but the next pass still saves it once the file is writable
+    monkeypatch.setattr(blocklist, 'BLOCKLIST_PATH', str(blocklist_path))
+    assert watcher.poll() == {'game.exe'}
+    assert saved(blocklist_path) == ['game.exe']
+    assert watcher.poll() == set()
+
+
+def test_games_are_saved_in_the_blocklists_case(blocklist_path):
+    table = FakeProcessTable()
+    watcher = GameWatcher(process_table=table)
+    watcher.poll()
+    blocklist.toggle_blocklist('game.exe')
+    table.spawn('Game.exe')
+    assert watcher.poll() == set()
+    table.spawn('Other.exe')
+    assert watcher.poll() == {'other.exe'}
+    assert saved(blocklist_path) == ['game.exe', 'other.exe']
@@ -0,0 +1,75 @@
+import math
+import random
+
+import easing_functions
+
+from SmoothedScroll import ScrollConfig
+from SmoothedScroll.replay import Replay, percentile
+from SmoothedScroll.utils import StaticRefreshRate, WheelEvent
+
+FREQUENCY = 144
+VBLANK = 0.0031  # phase of the fake display's vblanks
+NOTCHES = 100
+SESSIONS = 3
+
+
+class FakeDisplay(StaticRefreshRate):
+    def last_vblank(self):
+        return VBLANK
+
+
+def make_config():
+    return ScrollConfig(120, 1.0, 1.2, 70, 14, 500, 3.0, easing_functions.LinearInOut, False)
+
+
+def wheel_session(seed):
+    # jittered gaps, so neither mode gets a fixed phase to the frame grid
+    rng = random.Random(seed)
+    time = 0
+    events = []
+    for _ in range(NOTCHES):
+        time += rng.choice((0.013, 0.047, 0.2, 0.9)) * rng.uniform(0.8, 1.25)
+        events.append(WheelEvent(time, 120, False))
+    return events
+
+
+def replayed(immediate):
+    # latencies of every notch, of the notches that arrive with nothing animating, and the output call times
+    latencies, idle, calls = [], [], []
+    for seed in range(SESSIONS):
+        config = make_config()
+        replay = Replay(config, FREQUENCY, refresh_rate=FakeDisplay(FREQUENCY), immediate_first_frame=immediate)
+        events = wheel_session(seed)
+        report = replay.run(events)
+        latencies += report.latencies
+        previous = -math.inf
+        for event, latency in zip(events, report.latencies):
+            if event.time - previous > config.duration:
+                idle.append(latency)
+            previous = event.time
+        calls += (time for time, _, _ in replay.sink.calls)
+    return latencies, idle, calls
+
+
+def test_idle_notch_reaches_the_screen_sooner():
+    latencies = {}
+    for immediate in (False, True):
+        replay = Replay(make_config(), FREQUENCY, refresh_rate=FakeDisplay(FREQUENCY),
+                        immediate_first_frame=immediate)
+        latencies[immediate] = replay.run([WheelEvent(1.0, 120, False)]).latencies[0]
+    assert latencies[True] < latencies[False]
+
+
+def test_immediate_frames_stay_on_the_vblank_grid():
+    interval = 1 / FREQUENCY
+    _, _, calls = replayed(immediate=True)
+    assert calls
+    assert max(abs((time - VBLANK + interval / 2) % interval - interval / 2) for time in calls) < 1e-6
+
+
+def test_immediate_mode_is_never_slower_than_the_timer_path():
+    timer, timer_idle, _ = replayed(immediate=False)
+    immediate, immediate_idle, _ = replayed(immediate=True)
+    for q in (50, 99):
+        assert percentile(immediate, q) <= percentile(timer, q)
+        assert percentile(immediate_idle, q) <= percentile(timer_idle, q)
@@ -0,0 +1,117 @@
+from collections import deque
+
+from SmoothedScroll.utils import HookHost, HookWatchdog, HOOK_TIMEOUT
+
+TICKS_PER_CHECK = 32  # mouse events between two watchdog checks, the default 0.25 s of a 125 Hz mouse
+
+
+class FakeHookHost(HookHost):
+    # stands in for WH_MOUSE_LL: like Windows, it drops the hook after a callback outlives the system timeout
+    # and can be told to drop it for no visible reason; the listener thread is a queue pumped by the driver
+    def __init__(self):
+        self.installed = False
+        self.position = (0, 0)
+        self.calls = deque()
+        self.installs = 0
+
+    def install(self):
+        self.installed = True
+        self.installs += 1
+
+    def uninstall(self):
+        self.installed = False
+
+    def pointer_position(self):
+        return self.position
+
+    def call_on_listener(self, function):
+        self.calls.append(function)
+
+    def pump(self):
+        while self.calls:
+            self.calls.popleft()()
+
+
+def installed():
+    host = FakeHookHost()
+    host.install()
+    return host, HookWatchdog(host)
+
+
+def simulate(watchdog, host, ticks, slow=(), silent=(), over_budget=()):
+    # moves the pointer once per tick; returns the ticks the hook missed
+    missed = 0
+    for tick in range(ticks):
+        host.pump()
+        if tick in silent:
+            host.installed = False
+        host.position = (tick, tick)
+        if not host.installed:
+            missed += 1
+        else:
+            duration = 1e-4
+            if tick in slow:
+                duration = HOOK_TIMEOUT * 1.5
+                host.installed = False
+            elif tick in over_budget:
+                duration = watchdog.budget * 2
+            watchdog.record(duration)
+        if tick % TICKS_PER_CHECK == TICKS_PER_CHECK - 1:
+            watchdog.check()
+    host.pump()
+    return missed
+
+
+def test_healthy_hook_is_left_alone():
+    host, watchdog = installed()
+    assert simulate(watchdog, host, 1_000) == 0
+    assert watchdog.stats() == {'callbacks': 1_000, 'over_budget': 0, 'timeouts': 0, 'quiet': 0, 'reinstalls': 0}
+    assert host.installs == 1
+
+
+def test_over_budget_callbacks_are_counted_without_reinstalling():
+    host, watchdog = installed()
+    simulate(watchdog, host, 500, over_budget={10, 20, 30})
+    assert watchdog.over_budget == 3
+    assert watchdog.timeouts == 0
+    assert watchdog.reinstalls == 0
+
+
+def test_callback_past_the_system_timeout_reinstalls_on_the_listener():
+    host, watchdog = installed()
+    watchdog.record(HOOK_TIMEOUT * 1.5)
+    assert watchdog.reinstalls == 0  # nothing runs until the listener thread picks it up
+    watchdog.record(HOOK_TIMEOUT * 1.5)
+    assert len(host.calls) == 1  # a pending reinstall is not queued twice
+    host.pump()
+    assert (watchdog.timeouts, watchdog.over_budget, watchdog.reinstalls) == (2, 2, 1)
+    assert host.installed and host.installs == 2
+
+
+def test_silent_unhook_is_noticed_and_repaired():
+    host, watchdog = installed()
+    missed = simulate(watchdog, host, 2_000, slow={300}, silent={900, 1600}, over_budget={100, 1200})
+    stats = watchdog.stats()
+    assert (stats['over_budget'], stats['timeouts'], stats['quiet'], stats['reinstalls']) == (3, 1, 2, 3)
+    assert host.installed
+    # a silent unhook is only noticed once a whole interval passed without callbacks, so each one loses
+    # at most two intervals of input
+    assert missed <= 2 * 2 * TICKS_PER_CHECK
+
+
+def test_still_pointer_is_not_a_quiet_hook():
+    host, watchdog = installed()
+    for _ in range(5):
+        assert not watchdog.check()
+    host.position = None  # the pointer can't be read, e.g. on the secure desktop
+    assert not watchdog.check()
+    assert watchdog.quiet == 0
+
+
+def test_stop_ends_the_thread():
+    host, watchdog = installed()
+    watchdog.interval = 0.01
+    watchdog.start()
+    watchdog.stop()
+    watchdog.join(timeout=1)
+    assert not watchdog.is_alive()
@@ -0,0 +1,82 @@
+import easing_functions
+
+from SmoothedScroll import ScrollConfig
+from SmoothedScroll.replay import Replay
+from SmoothedScroll.utils import DisplayQuery, CachedRefreshRate, StaticRefreshRate, VirtualClock, WheelEvent
+from SmoothedScroll.utils.refresh_rate import FALLBACK_FREQUENCY
+
+
+class StubDisplayQuery(DisplayQuery):
+    # monitors by name with their refresh rates, and which one is under the cursor
+    def __init__(self, frequencies, current):
+        self.frequencies = dict(frequencies)
+        self.current = current
+        self.queries = 0
+
+    def current_monitor(self):
+        return self.current
+
+    def monitor_frequency(self, monitor):
+        self.queries += 1
+        return self.frequencies[monitor]
+
+
+def test_each_monitor_is_queried_once():
+    query = StubDisplayQuery({'left': 144, 'right': 240}, 'left')
+    provider = CachedRefreshRate(query, clock=VirtualClock())
+    seen = []
+    for i in range(10):
+        query.current = 'left' if i % 2 else 'right'
+        seen.append(provider.frequency())
+    assert seen == [240, 144] * 5
+    assert query.queries == 2
+
+
+def test_entries_expire_after_the_ttl():
+    # a rate change without a display change notification is picked up once the entry expires
+    query = StubDisplayQuery({'only': 240}, 'only')
+    clock = VirtualClock()
+    provider = CachedRefreshRate(query, ttl=5, clock=clock)
+    provider.frequency()
+    query.frequencies['only'] = 60
+    clock.advance(4.9)
+    assert provider.frequency() == 240
+    clock.advance(5.1)
+    assert provider.frequency() == 60
+
+
+def test_invalidate_drops_every_monitor():
+    query = StubDisplayQuery({'left': 144, 'right': 240}, 'left')
+    provider = CachedRefreshRate(query, clock=VirtualClock())
+    provider.frequency()
+    query.current = 'right'
+    provider.frequency()
+    query.frequencies.update(left=165, right=75)
+    provider.invalidate()
+    assert provider.frequency() == 75
+    query.current = 'left'
+    assert provider.frequency() == 165
+
+
+def test_hardware_default_falls_back():
+    # 0 and 1 mean "hardware default"
+    for reported in (0, 1):
+        assert CachedRefreshRate(StubDisplayQuery({'only': reported}, 'only')).frequency() == FALLBACK_FREQUENCY
+
+
+def frames_for_one_notch(replay):
+    return len(replay.run([WheelEvent(0.1, 120, False)]).frame_times)
+
+
+def test_pacing_follows_the_monitor_under_the_cursor():
+    # the interval is looked up as each animation starts, so moving to a faster monitor between two
+    # notches paces the second one faster
+    config = ScrollConfig(120, 1.0, 1.2, 70, 14, 500, 3.0, easing_functions.LinearInOut, False)
+    query = StubDisplayQuery({'left': 60, 'right': 240}, 'left')
+    replay = Replay(config, refresh_rate=CachedRefreshRate(query))
+    slow = frames_for_one_notch(replay)
+    query.current = 'right'
+    fast = frames_for_one_notch(replay)
+    assert 3.5 < fast / slow < 4.5
+    # the same as on a fixed 240 Hz display, give or take the frame the notch lands in
+    assert abs(frames_for_one_notch(Replay(config, refresh_rate=StaticRefreshRate(240))) - fast) <= 1
@@ -0,0 +1,56 @@
+import easing_functions
+import pytest
+
+from SmoothedScroll.models import ScrollEventQueue, MergedAnimation
+from SmoothedScroll.utils import CurveTable
+
+
+def linear(duration):
+    return lambda elapsed: min(elapsed / duration, 1)
+
+
+def test_finished_records_are_reused_from_scratch():
+    queue = ScrollEventQueue()
+    queue.append(120, False, 0.1, 0, linear(0.1))
+    assert queue.advance(0.05) == (pytest.approx(60), 0)
+    assert queue.advance(0.1) == (pytest.approx(60), 0)
+    assert len(queue) == 0
+
+    # the next impulse gets the finished record back, and starts from its own zero rather than the old position
+    record = queue._free[-1]
+    queue.append(-30, True, 0.2, 1, linear(0.2))
+    assert queue._events == [record]
+    assert queue.advance(1.1) == (0, pytest.approx(-15))
+    assert queue.advance(1.2) == (0, pytest.approx(-15))
+
+
+def test_records_stop_growing_under_a_steady_spin():
+    queue = ScrollEventQueue()
+    curve = linear(0.5)
+    records = []
+    for notch in range(100):
+        queue.append(120, False, 0.5, notch / 16, curve)
+        queue.advance(notch / 16)
+        records.append(len(queue) + len(queue._free))
+    # eight notches overlap; once as many records exist, every impulse reuses one
+    assert records[20:] == [records[20]] * 80
+
+
+@pytest.mark.parametrize('interval, count', [(0.15, 10), (0.03, 30), (0.01, 100), (0.003, 600)])
+def test_merged_animation_follows_the_stacked_ones(interval, count):
+    # a wheel spin at a steady rate, sampled at 144 Hz: one merged animation against the sum of one per notch
+    curve = CurveTable(3.0, easing_functions.LinearInOut, 0.5)
+    starts = [notch * interval for notch in range(count)]
+    merged = MergedAnimation()
+    position = added = 0
+    worst = 0
+    for frame in range(int((starts[-1] + 0.5) * 144) + 2):
+        time = frame / 144
+        while added < count and starts[added] <= time:
+            merged.add(120, 0.5, starts[added], curve)
+            added += 1
+        position += merged.advance(time)
+        worst = max(worst, abs(position - sum(120 * curve(time - start) for start in starts[:added])))
+    assert position == pytest.approx(120 * count)
+    assert not merged.active
+    assert worst < 0.03 * 120 * count
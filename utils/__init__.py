@@ -1,3 +1,4 @@
-from .blocklist import load_blocklist, write_blocklist, toggle_blocklist
-from .find_games import find_games
-from .config import load_config, save_config, DEFAULT_CONFIG
\ No newline at end of file
+from .blocklist import load_blocklist, write_blocklist, toggle_blocklist, add_to_blocklist
+from .find_games import find_games, GameWatcher
+from .config import load_config, save_config, DEFAULT_CONFIG
+from .process_index import ProcessNameIndex, WindowTable, Win32WindowTable
@@ -1,6 +1,8 @@
 import json
 import os
 
+from SmoothedScroll.utils import blocklist_name, blocklist_names
+
 BLOCKLIST_PATH = os.path.join(os.getenv('APPDATA'), 'SmoothedScroll', 'blocklist.json')
 
 def load_blocklist():
@@ -14,7 +16,7 @@ def load_blocklist():
             blocklist = json.loads(data)
             if not isinstance(blocklist, list):
                 return []
-            return [str(item) for item in blocklist]
+            return blocklist_names(blocklist)
     except json.JSONDecodeError:
         return []
     except Exception as e:
@@ -22,18 +24,33 @@ def load_blocklist():
         return []
 
 def write_blocklist(blocklist):
+    # write to a temporary file and swap it in, so readers never see a half-written list; returns whether
+    # the list was saved
+    temp_path = BLOCKLIST_PATH + '.tmp'
     try:
-        with open(BLOCKLIST_PATH, 'w', encoding='utf-8') as file:
-            json.dump(blocklist, file, indent=2)
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(blocklist_names(blocklist), file, indent=2)
+        os.replace(temp_path, BLOCKLIST_PATH)
     except Exception as e:
         print(f"Failed to save blocklist: {e}")
+        return False
+    return True
 
 def toggle_blocklist(process_name):
     blocklist = load_blocklist()
-    process_name = str(process_name)
+    process_name = blocklist_name(process_name)
     if process_name in blocklist:
-        blocklist.remove(process_name)
+        blocklist = [name for name in blocklist if name != process_name]
     else:
         blocklist.append(process_name)
-    write_blocklist(blocklist)
-    return blocklist
\ No newline at end of file
+    if not write_blocklist(blocklist):
+        return load_blocklist()  # the list as it still is on disk
+    return blocklist
+
+def add_to_blocklist(process_names):
+    # returns the names that weren't listed yet, or None when the list couldn't be saved
+    blocklist = load_blocklist()
+    added = {blocklist_name(name) for name in process_names}.difference(blocklist)
+    if added and not write_blocklist(blocklist + sorted(added)):
+        return None
+    return added
@@ -1,25 +1,95 @@
 import psutil
-import time
 import os
-from utils.blocklist import write_blocklist, load_blocklist
+from threading import Thread, Event
+from utils.blocklist import add_to_blocklist
 
-def find_games():
-    while True: 
-        try:
-            for proc in psutil.process_iter(['pid', 'name', 'exe']):
-                if "steam" in proc.info['name'].lower() and "steamwebhelper" not in proc.info['name'].lower() and proc.info['exe']:
-                    parent = psutil.Process(proc.info['pid'])
-                    children = parent.children(recursive=True)
-                    for child in children:
-                        if child.exe() and "steamwebhelper" not in child.name().lower():
-                            exe_name = os.path.splitext(os.path.basename(child.exe()))[0] + '.exe'
-                            blocklist = load_blocklist()
-                            if exe_name not in blocklist:
-                                blocklist.append(exe_name)  
-                                write_blocklist(blocklist) 
-                            else:
-                                print(f"{exe_name}")
 
+class PsutilProcessTable:
+    def pids(self):
+        return psutil.pids()
+
+    def info(self, pid):
+        # (name, exe, ppid), or None once the process is gone or off limits
+        try:
+            process = psutil.Process(pid)
+            with process.oneshot():
+                return process.name(), process.exe(), process.ppid()
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            continue
-        time.sleep(5)
\ No newline at end of file
+            return None
+
+
+def is_steam(name):
+    name = name.lower()
+    return "steam" in name and "steamwebhelper" not in name
+
+
+class GameWatcher(Thread):
+    def __init__(self, interval=5, process_table=None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.interval = interval
+        self._table = process_table or PsutilProcessTable()
+        self._processes = {}  # pid -> (name, exe, ppid) for every pid seen so far, None where it couldn't be read
+        self._steam_tree = set()  # Steam pids and everything they spawned
+        self._unsaved = set()  # games found earlier that couldn't be written to the blocklist yet
+        self._stop_event = Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.poll()
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def poll(self):
+        # scan() reports a game only on the pass its process appears, so one that couldn't be saved is kept
+        # and retried on every pass until the write goes through
+        games = self.scan() | self._unsaved
+        if not games:
+            return set()
+        added = add_to_blocklist(games)
+        if added is None:
+            self._unsaved = games
+            return set()
+        self._unsaved = set()
+        return added
+
+    def scan(self):
+        # only pids that appeared since the last pass are inspected; returns the exe names of new Steam games
+        pids = set(self._table.pids())
+        for pid in self._processes.keys() - pids:
+            del self._processes[pid]
+            self._steam_tree.discard(pid)
+
+        # unreadable pids (mostly AccessDenied for services and elevated processes) are remembered as None,
+        # so they are asked about once and not again on every pass until they exit
+        new_pids = pids - self._processes.keys()
+        for pid in new_pids:
+            self._processes[pid] = self._table.info(pid)
+
+        games = set()
+        for pid in new_pids:
+            if self._processes[pid] is None or not self._in_steam_tree(pid):
+                continue
+            name, exe, ppid = self._processes[pid]
+            if exe and ppid in self._steam_tree and "steamwebhelper" not in name.lower():
+                games.add(os.path.splitext(os.path.basename(exe))[0] + '.exe')
+        return games
+
+    def _in_steam_tree(self, pid):
+        chain = []
+        while pid not in self._steam_tree:
+            info = self._processes.get(pid)
+            if info is None or pid in chain:
+                return False
+            name, exe, ppid = info
+            chain.append(pid)
+            if is_steam(name) and exe:
+                break
+            pid = ppid
+        self._steam_tree.update(chain)
+        return True
+
+
+def find_games():
+    GameWatcher().run()
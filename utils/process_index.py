@@ -0,0 +1,61 @@
+import psutil
+
+
+class WindowTable:
+    # the OS calls ProcessNameIndex needs; Win32WindowTable implements them with pywin32 and psutil
+    def window_pids(self):
+        raise NotImplementedError
+
+    def process_name(self, pid):
+        raise NotImplementedError
+
+
+class Win32WindowTable(WindowTable):
+    def __init__(self):
+        import win32gui
+        import win32process
+        self._win32gui = win32gui
+        self._win32process = win32process
+
+    def window_pids(self):
+        # pids owning a visible window with a title, the same windows the Exceptions menu always listed
+        win32gui = self._win32gui
+        get_pid = self._win32process.GetWindowThreadProcessId
+
+        def enum_window_callback(hwnd, pids):
+            if win32gui.IsWindowVisible(hwnd) and win32gui.GetWindowText(hwnd):
+                pids.add(get_pid(hwnd)[1])
+
+        pids = set()
+        win32gui.EnumWindows(enum_window_callback, pids)
+        return pids
+
+    def process_name(self, pid):
+        try:
+            return psutil.Process(pid).name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+
+
+class ProcessNameIndex:
+    # exe names of processes that own a visible window. Each refresh diffs the windowed pids against the
+    # previous pass, so a name is only queried once per pid and forgotten when the pid no longer has a window
+    def __init__(self, window_table=None):
+        self._table = window_table or Win32WindowTable()
+        self._names = {}  # pid -> exe name, None when it could not be read
+        self._sorted = []
+
+    def refresh(self):
+        pids = set(self._table.window_pids())
+        gone = self._names.keys() - pids
+        new = pids - self._names.keys()
+        for pid in gone:
+            del self._names[pid]
+        for pid in new:
+            self._names[pid] = self._table.process_name(pid)
+        if gone or new:
+            self._sorted = sorted({name for name in self._names.values() if name})
+        return self._sorted
+
+    def names(self):
+        return self._sorted